@@ -0,0 +1,64 @@
+"""
+Compares `AlertQueue`, the queue of the default `FIFOPolicy`, with the
+`SetQueue` it replaced, under heavy re-alerting: each wave, every one of
+`PROPAGATORS` propagators is alerted `ALERTS` times before the wave is
+taken from the queue.
+
+Run it from the repository root:
+
+    python -m benchmarks.alert_queue
+"""
+
+import timeit
+
+from propagator import Cell, Network, Propagator
+from propagator.util import AlertQueue, SetQueue
+
+PROPAGATORS = 1000
+ALERTS = 10
+WAVES = 200
+
+def nothing():
+    pass
+
+def set_queue_waves(propagators):
+    queue = SetQueue()
+    add = queue.add
+
+    for _ in range(WAVES):
+        for _ in range(ALERTS):
+            for p in propagators:
+                add(p)
+        wave = list(queue)
+        queue.clear()
+
+def alert_queue_waves(propagators):
+    queue = AlertQueue()
+    add = queue.add
+
+    for _ in range(WAVES):
+        for _ in range(ALERTS):
+            for p in propagators:
+                add(p)
+        wave = queue.take()
+
+def main():
+    with Network():
+        cell = Cell()
+        propagators = [Propagator([cell], nothing) for _ in range(PROPAGATORS)]
+    functions = [lambda: None for _ in range(PROPAGATORS)]
+
+    print("{PROPAGATORS} propagators x {ALERTS} alerts x {WAVES} waves".format(**globals()))
+
+    for name, items in [("propagators", propagators), ("plain functions", functions)]:
+        before = min(timeit.repeat(lambda: set_queue_waves(items), number=1, repeat=3))
+        after = min(timeit.repeat(lambda: alert_queue_waves(items), number=1, repeat=3))
+        alerts = PROPAGATORS * ALERTS * WAVES
+
+        print("  {name}".format(**vars()))
+        print("    SetQueue                {ns:8.1f} ns/alert".format(ns=before / alerts * 1e9))
+        print("    AlertQueue              {ns:8.1f} ns/alert ({speedup:.1f}x)".format(
+            ns=after / alerts * 1e9, speedup=before / after))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures the cost of calling generic operators, compared with calling
+the function they choose directly, and with choosing it without their
+dispatch cache, as they do the first time they see the types of their
+arguments. It also compares calling them on each of many argument
+tuples with `apply_many`.
+
+Run it from the repository root:
+
+    python -m benchmarks.dispatch
+"""
+
+import timeit
+
+import propagator.content.supported
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.merging import merge
+from propagator.operator import add, mul, sqrt
+
+NUMBER = 200000
+MANY = 10000
+
+def resolve(generic, *args):
+    generic._functions.clear()
+    generic._candidates.clear()
+    return generic.operator_for(*args)
+
+def report(name, statement, namespace):
+    seconds = min(timeit.repeat(statement, globals=namespace, number=NUMBER, repeat=3))
+    print("  {name:34} {ns:8.1f} ns/call".format(name=name, ns=seconds / NUMBER * 1e9))
+
+def report_many(name, statement, namespace):
+    seconds = min(timeit.repeat(statement, globals=namespace, number=10, repeat=3))
+    print("  {name:34} {ns:8.1f} ns/tuple".format(name=name, ns=seconds / 10 / MANY * 1e9))
+
+def main():
+    namespace = dict(globals(),
+        x=1.5, y=2.5,
+        i=Interval(1, 2), j=Interval(3, 4),
+        s=Supported(Interval(1, 3), {'a'}), t=Supported(Interval(2, 4), {'b'}))
+
+    cases = [
+        ("floats", "add", "x, y"),
+        ("intervals", "mul", "i, j"),
+        ("supported merge", "merge", "s, t"),
+        ("supported and interval merge", "merge", "s, i"),
+    ]
+
+    for name, generic, args in cases:
+        namespace["chosen"] = eval("{generic}.operator_for({args})".format(**vars()), namespace)
+
+        print(name)
+        report("chosen function, called directly", "chosen({args})".format(**vars()), namespace)
+        report("generic operator", "{generic}({args})".format(**vars()), namespace)
+        report("resolution without cache", "resolve({generic}, {args})".format(**vars()), namespace)
+
+    namespace.update(
+        floats=[(float(n),) for n in range(MANY)],
+        pairs=[(Supported(Interval(n, n + 2), {'a'}), Supported(Interval(n + 1, n + 3), {'b'}))
+               for n in range(MANY)])
+
+    for name, generic, args_list in [("sqrt of floats", "sqrt", "floats"),
+                                     ("supported merges", "merge", "pairs")]:
+        print("{name}, {MANY} at once".format(name=name, MANY=MANY))
+        report_many("calls in a loop", "[{generic}(*args) for args in {args_list}]".format(**vars()), namespace)
+        report_many("apply_many", "{generic}.apply_many({args_list})".format(**vars()), namespace)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Measures wiring one cell to many propagators, and alerting all of them
+when the cell changes.
+
+Run it from the repository root:
+
+    python -m benchmarks.fan_out
+"""
+
+import time
+
+from propagator import Cell, Network, Propagator
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5]
+
+def nothing():
+    pass
+
+def measure(size):
+    network = Network()
+
+    with network:
+        shared = Cell('shared')
+
+        start = time.perf_counter()
+        for _ in range(size):
+            Propagator([shared], nothing)
+        wired = time.perf_counter() - start
+
+    network.scheduler.alerted_propagators.clear()
+
+    start = time.perf_counter()
+    shared.add_content(1)
+    alerted = time.perf_counter() - start
+
+    assert len(network.scheduler.alerted_propagators) == size
+    return wired, alerted
+
+def main():
+    print("{0:>10} {1:>12} {2:>12}".format("neighbors", "wiring (s)", "alerting (s)"))
+
+    for size in SIZES:
+        wired, alerted = measure(size)
+        print("{size:10} {wired:12.3f} {alerted:12.4f}".format(**vars()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares evaluating many tolerance scenarios of the barometer network
+from `examples/multidirectional_computation.py` one at a time, with
+`Interval` contents, and all at once, with `IntervalArray` contents.
+
+Each scenario has its own stopwatch reading of the fall time, all of
+them consistent with the other measurements, since `Interval` networks
+cannot go on after a contradiction.
+
+Run it from the repository root:
+
+    python -m benchmarks.interval_array
+"""
+
+import random
+import time
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.content.interval_array import IntervalArray
+
+import examples.multidirectional_computation as barometer
+
+SCENARIOS = 1000
+
+"""
+Builds the barometer network, feeds it the measurements, with
+`fall_time` as the fall time, and returns the building height.
+"""
+def building_height(fall_time, wrap):
+    scheduler.initialize()
+
+    barometer_height = Cell('barometer height')
+    barometer_shadow = Cell('barometer shadow')
+    building_height = Cell('building height')
+    building_shadow = Cell('building shadow')
+    fall_time_cell = Cell('fall time')
+
+    barometer.similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+    barometer.fall_duration(fall_time_cell, building_height)
+
+    building_shadow.add_content(wrap(54.9, 55.1))
+    barometer_height.add_content(wrap(0.3, 0.32))
+    barometer_shadow.add_content(wrap(0.36, 0.37))
+    fall_time_cell.add_content(fall_time)
+    scheduler.run()
+
+    return building_height.content
+
+def main():
+    random.seed(0)
+    fall_times = []
+    for _ in range(SCENARIOS):
+        low = random.uniform(2.9, 3.0)
+        fall_times.append(Interval(low, low + random.uniform(0.12, 0.3)))
+
+    start = time.perf_counter()
+    heights = [building_height(fall_time, Interval) for fall_time in fall_times]
+    one_at_a_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    array = IntervalArray([i.low for i in fall_times], [i.high for i in fall_times])
+    array_heights = building_height(array, Interval)
+    all_at_once = time.perf_counter() - start
+
+    assert all(abs(height.low - array_heights[n].low) < 1e-9 and abs(height.high - array_heights[n].high) < 1e-9
+               for n, height in enumerate(heights))
+
+    print("{SCENARIOS} scenarios".format(SCENARIOS=SCENARIOS))
+    print("  {name:14} {seconds:8.3f} s".format(name="one at a time", seconds=one_at_a_time))
+    print("  {name:14} {seconds:8.3f} s".format(name="all at once", seconds=all_at_once))
+
+if __name__ == '__main__':
+    main()
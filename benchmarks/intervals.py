@@ -0,0 +1,132 @@
+"""
+Compares `Interval` with the class it replaced, a copy of which is kept
+here as `OldInterval`, on interval-heavy propagation through copies of
+the barometer network from `examples/multidirectional_computation.py`,
+on hashing, and on size.
+
+Run it from the repository root:
+
+    python -m benchmarks.intervals
+"""
+
+import sys
+import time
+import timeit
+from math import sqrt
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.generic_operator import assign_operation
+from propagator.merging import Contradiction
+from propagator.operator import mul, truediv
+from propagator.primitives import constant
+
+import examples.multidirectional_computation as barometer
+
+COPIES = 200
+REPEAT = 5
+NUMBER = 100000
+
+"""
+`Interval` as it was: hashed through its `repr`, without `__slots__`,
+and with only the operations it had.
+"""
+class OldInterval:
+    def __init__(self, low, high=None):
+        self.low = low
+        self.high = high is None and low or high
+
+    def __str__(self):
+        return 'Interval({low}, {high})'.format(**vars(self))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __eq__(self, other):
+        return isinstance(other, OldInterval) and (self.low == other.low) and (self.high == other.high)
+
+    def __hash__(self):
+        return hash(repr(self))
+
+    def __and__(self, other):
+        return OldInterval(max(self.low, other.low), min(self.high, other.high))
+
+    def is_empty(self):
+        return self.low > self.high
+
+def _merge_old_intervals(content, increment):
+    new_range = content & increment
+
+    if new_range.is_empty():
+        return Contradiction('Empty merge: {content} & {increment} == {new_range}'.format(**vars()))
+    elif new_range == content:
+        return content
+    elif new_range == increment:
+        return increment
+    else:
+        return new_range
+
+assign_operation("merge", _merge_old_intervals, [OldInterval, OldInterval])
+assign_operation("sqrt", lambda i: OldInterval(sqrt(i.low), sqrt(i.high)), [OldInterval])
+assign_operation("mul",
+    lambda i1, i2: OldInterval(mul(i1.low, i2.low), mul(i1.high, i2.high)),
+    [OldInterval, OldInterval])
+assign_operation("truediv",
+    lambda i1, i2: mul(i1, OldInterval(truediv(1, i2.high), truediv(1, i2.low))),
+    [OldInterval, OldInterval])
+
+"""
+Builds `COPIES` barometer networks with `cls` contents and runs them.
+"""
+def propagate(cls):
+    scheduler.initialize()
+
+    for _ in range(COPIES):
+        barometer_height = Cell('barometer height')
+        barometer_shadow = Cell('barometer shadow')
+        building_height = Cell('building height')
+        building_shadow = Cell('building shadow')
+        fall_time = Cell('fall time')
+        g = Cell('g')
+        one_half = Cell('one half')
+        t_to_2 = Cell('t^2')
+        g_times_t_to_2 = Cell('gt^2')
+
+        barometer.similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+        (constant(cls(9.789, 9.832)))(g)
+        (constant(cls(1/2, 1/2)))(one_half)
+        barometer.quadratic(fall_time, t_to_2)
+        barometer.product(g, t_to_2, g_times_t_to_2)
+        barometer.product(one_half, g_times_t_to_2, building_height)
+
+        building_shadow.add_content(cls(54.9, 55.1))
+        barometer_height.add_content(cls(0.3, 0.32))
+        barometer_shadow.add_content(cls(0.36, 0.37))
+        fall_time.add_content(cls(2.9, 3.1))
+
+    scheduler.run()
+    return building_height.content
+
+def main():
+    for name, cls in [("old Interval", OldInterval), ("Interval", Interval)]:
+        seconds = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            height = propagate(cls)
+            seconds = min(seconds, time.perf_counter() - start)
+
+        interval = cls(1.25, 2.5)
+        hashing = min(timeit.repeat(lambda: hash(interval), number=NUMBER, repeat=3)) / NUMBER
+        size = sys.getsizeof(interval)
+        if hasattr(interval, "__dict__"):
+            size += sys.getsizeof(vars(interval))
+
+        print(name)
+        print("  {0:34} {1:8.3f} s".format("{COPIES} barometer networks".format(COPIES=COPIES), seconds))
+        print("  {0:34} {1:8.1f} ns".format("hash", hashing * 1e9))
+        print("  {0:34} {1:8} bytes".format("size", size))
+        print("  {0:34} {1}".format("building height", height))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Measures how much memory cells and propagators take, for networks of
+10^4 to 10^6 cells.
+
+Each network is a chain of cells, each one the absolute value of the
+previous one. Cells are measured first, on their own, and then the
+propagators between them; the propagators' share includes their place
+in the neighbors of their input cells and in the scheduler's queues.
+
+Run it from the repository root:
+
+    python -m benchmarks.memory
+"""
+
+import gc
+import tracemalloc
+
+from propagator import Cell, Network
+from propagator.primitives import absolute_value
+
+SIZES = [10 ** 4, 10 ** 5, 10 ** 6]
+
+def measure(size):
+    network = Network()
+    gc.collect()
+
+    tracemalloc.start()
+    with network:
+        cells = [Cell() for _ in range(size)]
+    after_cells = tracemalloc.get_traced_memory()[0]
+
+    with network:
+        for a, b in zip(cells, cells[1:]):
+            absolute_value(a, b)
+    after_propagators = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # The list of cells is not part of the network
+    cell_bytes = (after_cells - size * 8) / size
+    propagator_bytes = (after_propagators - after_cells) / (size - 1)
+
+    return cell_bytes, propagator_bytes
+
+def main():
+    print("{0:>10} {1:>16} {2:>22}".format("cells", "bytes per cell", "bytes per propagator"))
+
+    for size in SIZES:
+        cell_bytes, propagator_bytes = measure(size)
+        print("{size:10} {cell_bytes:16.1f} {propagator_bytes:22.1f}".format(**vars()))
+
+if __name__ == '__main__':
+    main()
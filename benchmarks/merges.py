@@ -0,0 +1,101 @@
+"""
+Counts the merges, and the comparisons between `Supported` contents,
+done while running scaled-up versions of the dependencies example, whose
+cells hold `Supported` intervals, and measures how long they take.
+
+Run it from the repository root:
+
+    python -m benchmarks.merges
+"""
+
+import time
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.merging import merge
+
+import examples.dependencies as dependencies
+
+COPIES = 50
+
+counts = {"merge": 0, "Supported == Supported": 0}
+
+"""
+The class of `merge` while it is being counted.
+"""
+class CountingOperator(type(merge)):
+    def __call__(self, x, y):
+        counts["merge"] += 1
+        return super().__call__(x, y)
+
+def counting_eq(eq):
+    def __eq__(self, other):
+        if isinstance(other, Supported):
+            counts["Supported == Supported"] += 1
+        return eq(self, other)
+    return __eq__
+
+"""
+Builds `COPIES` dependencies networks and feeds them the measurements of
+the example, running the scheduler after each one.
+"""
+def run():
+    fall_times = []
+    building_heights = []
+
+    for _ in range(COPIES):
+        barometer_height = Cell('barometer height')
+        barometer_shadow = Cell('barometer shadow')
+        building_height = Cell('building height')
+        building_shadow = Cell('building shadow')
+        fall_time = Cell('fall time')
+
+        dependencies.similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+        dependencies.fall_duration(fall_time, building_height)
+
+        building_shadow.add_content(Supported(Interval(54.9, 55.1), {'shadows'}))
+        barometer_height.add_content(Supported(Interval(0.3, 0.32), {'shadows'}))
+        barometer_shadow.add_content(Supported(Interval(0.36, 0.37), {'shadows'}))
+
+        fall_times.append(fall_time)
+        building_heights.append(building_height)
+    scheduler.run()
+
+    for fall_time in fall_times:
+        fall_time.add_content(Supported(Interval(2.9, 3.3), {'lousy fall time'}))
+    scheduler.run()
+
+    for fall_time in fall_times:
+        fall_time.add_content(Supported(Interval(2.9, 3.1), {'better fall time'}))
+    scheduler.run()
+
+    for building_height in building_heights:
+        building_height.add_content(Supported(45, {'superintendent'}))
+    scheduler.run()
+
+def main():
+    scheduler.initialize()
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+
+    scheduler.initialize()
+    generic_class = type(merge)
+    eq = Supported.__eq__
+    merge.__class__ = CountingOperator
+    Supported.__eq__ = counting_eq(eq)
+    try:
+        run()
+    finally:
+        merge.__class__ = generic_class
+        Supported.__eq__ = eq
+
+    print("{COPIES} dependencies networks".format(COPIES=COPIES))
+    for name, count in counts.items():
+        print("  {name:24} {count:8} calls".format(name=name, count=count))
+    print("  {name:24} {seconds:8.3f} s".format(name="run time", seconds=seconds))
+
+if __name__ == '__main__':
+    main()
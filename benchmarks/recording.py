@@ -0,0 +1,95 @@
+"""
+Measures the throughput cost of recording a change log, and compares
+replaying the log with running the network again.
+
+The network is the one from `examples/dependencies.py`, replicated.
+
+Run it from the repository root:
+
+    python -m benchmarks.recording
+"""
+
+import os
+import tempfile
+import time
+
+from propagator import Cell, Network
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.recording import Recorder, replay
+
+import examples.dependencies as dependencies
+
+COPIES = 200
+
+def build(network):
+    cells = []
+
+    with network:
+        for _ in range(COPIES):
+            copy = [Cell(name) for name in ['s_ba', 'h_ba', 's', 'h', 't']]
+            s_ba, h_ba, s, h, t = copy
+            dependencies.similar_triangles(s_ba, h_ba, s, h)
+            dependencies.fall_duration(t, h)
+
+            s.add_content(Supported(Interval(54.9, 55.1), {'shadows'}))
+            h_ba.add_content(Supported(Interval(0.3, 0.32), {'shadows'}))
+            s_ba.add_content(Supported(Interval(0.36, 0.37), {'shadows'}))
+            t.add_content(Supported(Interval(2.9, 3.1), {'fall time'}))
+            cells.extend(copy)
+
+    return cells
+
+REPEAT = 10
+
+"""
+Returns the best time of `REPEAT` calls to `function`, and its result.
+"""
+def timed(function, *args):
+    best = None
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+def propagate(path=None):
+    network = Network()
+    if path is None:
+        build(network)
+        return network.run()
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    with Recorder(path) as recorder:
+        network.scheduler.recorder = recorder
+        build(network)
+        return network.run()
+
+def main():
+    handle, path = tempfile.mkstemp(suffix=".plog")
+    os.close(handle)
+    os.remove(path)
+
+    try:
+        plain, _ = timed(propagate)
+        recorded, _ = timed(propagate, path)
+        replayed, contents = timed(replay, path)
+
+        print("dependencies x {COPIES}".format(COPIES=COPIES))
+        print("  propagation               {plain:8.3f}s".format(**vars()))
+        print("  propagation, recorded     {recorded:8.3f}s ({overhead:+.1%})".format(
+            overhead=(recorded - plain) / plain, **vars()))
+        print("  replay                    {replayed:8.3f}s ({speedup:.0f}x faster)".format(
+            speedup=plain / replayed, **vars()))
+        print("  log size                  {size:8} bytes for {cells} cells".format(
+            size=os.path.getsize(path), cells=len(contents)))
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
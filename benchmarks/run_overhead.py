@@ -0,0 +1,47 @@
+"""
+Measures the fixed cost of `Scheduler.run` on an empty network and on a
+network with a single propagator, which is what an application pays when
+it calls `run()` after every small input update.
+
+For comparison, it also measures the cost of entering a continuation
+with `propagator.util.callcc`, which every non-empty run used to pay to
+support `abort_process`, if `greenlet` is installed.
+
+Run it from the repository root:
+
+    python -m benchmarks.run_overhead
+"""
+
+import timeit
+
+from propagator import Cell, Network, Propagator
+
+NUMBER = 100000
+
+def report(name, seconds):
+    print("  {name:32} {usec:8.3f} us/run".format(name=name, usec=seconds / NUMBER * 1e6))
+
+def main():
+    empty = Network()
+    report("empty network", timeit.timeit(empty.run, number=NUMBER))
+
+    single = Network()
+    with single:
+        propagator = Propagator([Cell()], lambda: None)
+
+    def alert_and_run():
+        single.scheduler.alert_propagators(propagator)
+        single.run()
+
+    report("one-propagator network", timeit.timeit(alert_and_run, number=NUMBER))
+
+    try:
+        from propagator.util import callcc
+        import greenlet
+    except ImportError:
+        print("  greenlet is not installed; skipping callcc")
+    else:
+        report("callcc (former per-run cost)", timeit.timeit(lambda: callcc(lambda k: None), number=NUMBER))
+
+if __name__ == '__main__':
+    main()
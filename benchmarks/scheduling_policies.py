@@ -0,0 +1,87 @@
+"""
+Compares how many propagators each scheduling policy fires to reach the
+fixpoint of scaled-up versions of the barometer examples.
+
+The barometer network is the multidirectional one from
+`examples/multidirectional_computation.py`, with `Interval` contents; the
+dependencies network is the same network from `examples/dependencies.py`,
+with `Supported` contents.
+
+Run it from the repository root:
+
+    python -m benchmarks.scheduling_policies
+"""
+
+import time
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.scheduling import FIFOPolicy, RankPolicy, CostPolicy
+
+import examples.multidirectional_computation as barometer
+import examples.dependencies as dependencies
+
+COPIES = 50
+
+"""
+Prefers propagators with fewer empty input cells.
+"""
+def empty_inputs(propagator):
+    return sum(cell.content is None for cell in getattr(propagator, "neighbors", ()))
+
+POLICIES = [
+    ("fifo", FIFOPolicy),
+    ("rank", RankPolicy),
+    ("cost", lambda: CostPolicy(empty_inputs)),
+]
+
+def plain(value, premise):
+    return value
+
+"""
+Builds `COPIES` barometer networks using `example`'s constructors, and
+feeds them measurements wrapped by `wrap`.
+"""
+def build(example, wrap):
+    for _ in range(COPIES):
+        barometer_height = Cell('barometer height')
+        barometer_shadow = Cell('barometer shadow')
+        building_height = Cell('building height')
+        building_shadow = Cell('building shadow')
+        fall_time = Cell('fall time')
+
+        example.similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+        example.fall_duration(fall_time, building_height)
+
+        building_shadow.add_content(wrap(Interval(54.9, 55.1), {'shadows'}))
+        barometer_height.add_content(wrap(Interval(0.3, 0.32), {'shadows'}))
+        barometer_shadow.add_content(wrap(Interval(0.36, 0.37), {'shadows'}))
+        fall_time.add_content(wrap(Interval(2.9, 3.1), {'fall time'}))
+        building_height.add_content(wrap(Interval(45, 45), {'superintendent'}))
+
+def measure(example, wrap, policy):
+    scheduler.initialize(policy())
+    start = time.perf_counter()
+    build(example, wrap)
+    scheduler.run()
+    elapsed = time.perf_counter() - start
+    return scheduler.firings, scheduler.waves, elapsed
+
+def main():
+    for name, example, wrap in [("barometer", barometer, plain),
+                                ("dependencies", dependencies, Supported)]:
+        print("{name} x {COPIES}".format(name=name, COPIES=COPIES))
+        baseline = None
+
+        for policy_name, policy in POLICIES:
+            firings, waves, elapsed = measure(example, wrap, policy)
+            baseline = baseline or firings
+            print("  {policy_name:6} {firings:7} firings ({saved:+6.1%})  {waves:6} waves  {elapsed:.3f}s".format(
+                saved=(baseline - firings) / baseline, **vars()))
+
+    scheduler.initialize(FIFOPolicy())
+
+if __name__ == '__main__':
+    main()
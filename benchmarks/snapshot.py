@@ -0,0 +1,71 @@
+"""
+Compares restoring a network from a snapshot with propagating its inputs
+again.
+
+The network is the one from `examples/dependencies.py`, replicated.
+
+Run it from the repository root:
+
+    python -m benchmarks.snapshot
+"""
+
+import io
+import time
+
+from propagator import Network
+from propagator import snapshot
+
+from benchmarks.recording import COPIES, build
+
+REPEAT = 3
+
+"""
+Returns the best time of `REPEAT` calls to `function`.
+"""
+def timed(function):
+    best = None
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+def main():
+    network = Network()
+    build(network)
+    network.run()
+
+    buffer = io.BytesIO()
+    snapshot.save(buffer, network.scheduler)
+    data = buffer.getvalue()
+
+    def propagate():
+        network = Network()
+        build(network)
+        network.run()
+
+    def restore():
+        network = Network()
+        build(network)
+        snapshot.restore(io.BytesIO(data), network.scheduler)
+        network.run()
+        assert network.scheduler.firings == 0
+
+    def rebuild():
+        build(Network())
+
+    built = timed(rebuild)
+    propagated = timed(propagate)
+    restored = timed(restore)
+
+    print("dependencies x {COPIES}".format(COPIES=COPIES))
+    print("  build only                {built:8.3f}s".format(**vars()))
+    print("  build and propagate       {propagated:8.3f}s".format(**vars()))
+    print("  build and restore         {restored:8.3f}s".format(**vars()))
+    print("  snapshot size             {size:8} bytes".format(size=len(data)))
+
+if __name__ == '__main__':
+    main()
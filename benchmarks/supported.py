@@ -0,0 +1,112 @@
+"""
+Measures `Supported` values on many copies of the dependencies network
+from `examples/dependencies.py`, and compares hashing and comparing them
+with a copy of the class they replaced, kept here as `OldSupported`.
+
+Each copy gets the measurements of the example, one at a time, and the
+network runs after each one; then the contents of all the cells are put
+in a set, as a memo table of results would.
+
+Run it from the repository root:
+
+    python -m benchmarks.supported
+"""
+
+import time
+import timeit
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+
+import examples.dependencies as dependencies
+
+COPIES = 300
+REPEAT = 3
+NUMBER = 100000
+
+"""
+`Supported` as it was: mutable, hashed through its `repr`, and compared
+in full.
+"""
+class OldSupported:
+    def __init__(self, value, support):
+        self.value = value
+        self.support = support
+
+    def __str__(self):
+        return 'Supported({value}, {support})'.format(**vars(self))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __eq__(self, other):
+        return isinstance(other, OldSupported) and \
+                self.value == other.value and \
+                self.support == other.support
+
+    def __hash__(self):
+        return hash(repr(self))
+
+"""
+Builds `COPIES` dependencies networks, feeds them the example's
+measurements, and returns the time it takes and the cells.
+"""
+def propagate():
+    scheduler.initialize()
+    cells = []
+
+    start = time.perf_counter()
+
+    for _ in range(COPIES):
+        barometer_height = Cell('barometer height')
+        barometer_shadow = Cell('barometer shadow')
+        building_height = Cell('building height')
+        building_shadow = Cell('building shadow')
+        fall_time = Cell('fall time')
+
+        dependencies.similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+        dependencies.fall_duration(fall_time, building_height)
+        cells.append((barometer_height, barometer_shadow, building_height, building_shadow, fall_time))
+
+    measurements = [
+        (3, Supported(Interval(54.9, 55.1), {'shadows'})),
+        (0, Supported(Interval(0.3, 0.32), {'shadows'})),
+        (1, Supported(Interval(0.36, 0.37), {'shadows'})),
+        (4, Supported(Interval(2.9, 3.3), {'lousy fall time'})),
+        (4, Supported(Interval(2.9, 3.1), {'better fall time'})),
+        (2, Supported(45, {'superintendent'})),
+    ]
+
+    for index, content in measurements:
+        for network in cells:
+            network[index].add_content(content)
+        scheduler.run()
+
+    propagated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    memo = {cell.content for network in cells for cell in network}
+    memoized = time.perf_counter() - start
+
+    return propagated, memoized, len(memo)
+
+def main():
+    propagated, memoized, distinct = min(propagate() for _ in range(REPEAT))
+
+    print("{COPIES} dependencies networks".format(COPIES=COPIES))
+    print("  {0:34} {1:8.3f} s".format("propagation", propagated))
+    print("  {0:34} {1:8.4f} s ({2} distinct)".format("set of all contents", memoized, distinct))
+
+    for name, cls in [("old Supported", OldSupported), ("Supported", Supported)]:
+        namespace = dict(a=cls(Interval(44.5, 47.2), Supported(0, {'shadows', 'better fall time'}).support),
+                         b=cls(Interval(44.5, 47.2), Supported(0, {'shadows', 'better fall time'}).support))
+
+        print(name)
+        for operation in ["hash(a)", "a == b", "a == a"]:
+            seconds = min(timeit.repeat(operation, globals=namespace, number=NUMBER, repeat=3))
+            print("  {0:34} {1:8.1f} ns".format(operation, seconds / NUMBER * 1e9))
+
+if __name__ == '__main__':
+    main()
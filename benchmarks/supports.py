@@ -0,0 +1,80 @@
+"""
+Measures dependency tracking with many premises: the operations on
+`Support`s, compared with a copy of the `set` subclass they replaced,
+kept here as `OldSupport`, and a network that sums `Supported` values
+with one premise each.
+
+Run it from the repository root:
+
+    python -m benchmarks.supports
+"""
+
+import random
+import time
+import timeit
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.supported import Support, Supported
+from propagator.primitives import adder
+
+PREMISES = 300
+NUMBER = 20000
+
+"""
+`Support` as it was: a `set` of premises.
+"""
+class OldSupport(set):
+    def more_informative_than(self, other):
+        return self != other and self.issubset(other)
+
+"""
+Builds a chain of adders that sums `PREMISES` cells, each with a value
+supported by its own premise, so that the supports of the partial sums
+grow by one premise at each step, and returns the time it takes to run.
+"""
+def sum_premises():
+    scheduler.initialize()
+
+    cells = []
+    for n in range(PREMISES):
+        cell = Cell('x{n}'.format(n=n))
+        cell.add_content(Supported(n, {'premise {n}'.format(n=n)}))
+        cells.append(cell)
+
+    total = cells[0]
+    for cell in cells[1:]:
+        partial_sum = Cell()
+        adder(total, cell, partial_sum)
+        total = partial_sum
+
+    start = time.perf_counter()
+    scheduler.run()
+    seconds = time.perf_counter() - start
+
+    assert total.content.value == sum(range(PREMISES))
+    assert len(total.content.support) == PREMISES
+    return seconds
+
+def main():
+    random.seed(0)
+    premises = ['premise {n}'.format(n=n) for n in range(PREMISES)]
+    half = premises[:PREMISES // 2]
+    some = random.sample(premises, 20)
+
+    print("{PREMISES} premises".format(PREMISES=PREMISES))
+    for name, cls in [("old Support", OldSupport), ("Support", Support)]:
+        namespace = dict(a=cls(half), b=cls(some), c=cls(premises))
+
+        print(name)
+        for operation in ["a | b", "a.issubset(c)", "b.more_informative_than(c)", "hash(a)"]:
+            if operation == "hash(a)" and cls is OldSupport:
+                operation = "hash(frozenset(a))"
+            seconds = min(timeit.repeat(operation, globals=namespace, number=NUMBER, repeat=3))
+            print("  {0:34} {1:8.1f} ns".format(operation, seconds / NUMBER * 1e9))
+
+    seconds = min(sum_premises() for _ in range(5))
+    print("sum of {PREMISES} supported values: {seconds:.4f} s".format(PREMISES=PREMISES, seconds=seconds))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Measures flipping a premise in a network of `TMS` contents: `COPIES`
+copies of the dependencies network from `examples/dependencies.py`, each
+with premises of its own, where one copy's fall time is kicked out and
+brought back in.
+
+Flipping a premise alerts only the propagators that read values
+depending on it. It is compared with alerting every propagator, which
+is what a worldview change would cost without keeping track of readers.
+
+Run it from the repository root:
+
+    python -m benchmarks.worldviews
+"""
+
+import time
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.content.tms import TMS, worldview_of, kick_out, bring_in
+
+import examples.dependencies as dependencies
+
+REPEAT = 5
+
+"""
+Builds `copies` dependencies networks with `TMS` contents and runs them.
+"""
+def build(copies):
+    scheduler.initialize()
+    worldview_of(scheduler).reset()
+
+    for n in range(copies):
+        barometer_height = Cell('barometer height')
+        barometer_shadow = Cell('barometer shadow')
+        building_height = Cell('building height')
+        building_shadow = Cell('building shadow')
+        fall_time = Cell('fall time')
+
+        dependencies.similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+        dependencies.fall_duration(fall_time, building_height)
+
+        shadows = 'shadows {n}'.format(n=n)
+        building_shadow.add_content(TMS([Supported(Interval(54.9, 55.1), {shadows})]))
+        barometer_height.add_content(TMS([Supported(Interval(0.3, 0.32), {shadows})]))
+        barometer_shadow.add_content(TMS([Supported(Interval(0.36, 0.37), {shadows})]))
+        fall_time.add_content(TMS([Supported(Interval(2.9, 3.1), {'fall time {n}'.format(n=n)})]))
+
+    scheduler.run()
+
+"""
+Kicks out one copy's fall time and brings it back in, running the
+network after each flip, and returns the time it takes and the number
+of propagators fired. With `alert_all`, every propagator is alerted
+after each flip as well.
+"""
+def flip(alert_all):
+    firings = 0
+    start = time.perf_counter()
+    for change in (kick_out, bring_in):
+        change('fall time 0')
+        if alert_all:
+            scheduler.alert_all_propagators()
+        scheduler.run()
+        firings += scheduler.firings
+    return time.perf_counter() - start, firings
+
+def main():
+    for copies in [10, 100, 1000]:
+        print("{copies} dependencies networks".format(copies=copies))
+        for name, alert_all in [("alerting every propagator", True), ("alerting readers", False)]:
+            build(copies)
+            seconds, firings = min(flip(alert_all) for _ in range(REPEAT))
+            print("  {0:34} {1:8.4f} s {2:8} firings".format(name, seconds, firings))
+
+if __name__ == '__main__':
+    main()
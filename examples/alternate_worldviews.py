@@ -0,0 +1,91 @@
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.content.tms import TMS, kick_out, bring_in
+
+from examples.dependencies import similar_triangles, fall_duration
+
+"""
+The barometer network of `examples/dependencies.py`, with cells that
+keep every alternative supported value they learn, in a `TMS`.
+
+Instead of rebuilding the network to see what follows from a different
+set of measurements, we kick premises out of the worldview, and bring
+them back in, and the network only recomputes what depends on them.
+
+This example is present (as Scheme code) in section 6.3 of The Art of
+the Propagator, "Dependencies for Alternate Worldviews".
+"""
+
+if __name__ == '__main__':
+    scheduler.initialize()
+
+    barometer_height = Cell('barometer height')
+    barometer_shadow = Cell('barometer shadow')
+    building_height = Cell('building height')
+    building_shadow = Cell('building shadow')
+
+    similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+
+    building_shadow.add_content(TMS([Supported(Interval(54.9, 55.1), {'shadows'})]))
+    barometer_height.add_content(TMS([Supported(Interval(0.3, 0.32), {'shadows'})]))
+    barometer_shadow.add_content(TMS([Supported(Interval(0.36, 0.37), {'shadows'})]))
+
+    fall_time = Cell('fall time')
+    fall_duration(fall_time, building_height)
+
+    fall_time.add_content(TMS([Supported(Interval(2.9, 3.1), {'fall time'})]))
+
+    scheduler.run()
+
+    print(building_height.content.consequence())
+    # Supported(Interval(44.51351351351351, 47.24276000000001), {'fall time', 'shadows'})
+
+    # The cell keeps what follows from each measurement, so we can ask
+    # what we would know without the fall time:
+
+    kick_out('fall time')
+    scheduler.run()
+
+    print(building_height.content.consequence())
+    # Supported(Interval(44.51351351351351, 48.977777777777774), {'shadows'})
+
+    # Or without any measurement:
+
+    kick_out('shadows')
+    scheduler.run()
+
+    print(building_height.content.consequence())
+    # None
+
+    bring_in('fall time')
+    scheduler.run()
+
+    print(building_height.content.consequence())
+    # Supported(Interval(41.162745, 47.24276000000001), {'fall time'})
+
+    print(building_height.content)
+    # TMS([Supported(Interval(44.51351351351351, 48.977777777777774), {'shadows'}),
+    #      Supported(Interval(41.162745, 47.24276000000001), {'fall time'}),
+    #      Supported(Interval(44.51351351351351, 47.24276000000001), {'fall time', 'shadows'})])
+
+    # The superintendent's word is better than any of them:
+
+    building_height.add_content(Supported(45, {'superintendent'}))
+    bring_in('shadows')
+    scheduler.run()
+
+    print(building_height.content.consequence())
+    # Supported(45, {'superintendent'})
+
+    print(barometer_height.content.consequence())
+    # Supported(Interval(0.3, 0.30327868852459017), {'fall time', 'shadows', 'superintendent'})
+
+    # And the barometer height does not need the fall time any more:
+
+    kick_out('fall time')
+    scheduler.run()
+
+    print(barometer_height.content.consequence())
+    # Supported(Interval(0.3, 0.30327868852459017), {'shadows', 'superintendent'})
@@ -100,11 +100,9 @@ def sqrt_iter(x, g, answer):
     return sqrt_iter_helper
 
 """
-A `Cell` object containing a very small number.
-
-Used in `good_enuf`.
+A very small number, the tolerance of `good_enuf`.
 """
-eps = Cell('eps', content=0.0000000001)
+EPS = 0.0000000001
 
 """
 Creates a propagator network that stores `True` in `done` if `g` is good
@@ -115,8 +113,9 @@ To be good enough, `g` and `x` contents have to obey this equation:
 
     abs(x - pow(g, 2)) <= eps
 
-Where `eps` is a `Cell` object containing a very small number, and is
-defined in this module.
+Where `eps` is `EPS`, defined in this module. Each network gets its own
+`eps` cell, so that a cell shared by all of them does not keep them
+alive as neighbors.
 """
 def good_enuf(g, x, done):
     @compound(neighbors=[g, x])
@@ -124,6 +123,7 @@ def good_enuf(g, x, done):
         g_to_2 = Cell('g^2')
         x_minus_g_to_2 = Cell('x-g^2')
         ax_minus_g_to_2 = Cell('abs(x-g^2)')
+        eps = Cell('eps', content=EPS)
 
         multiplier(g, g, g_to_2)
         subtractor(x, g_to_2, x_minus_g_to_2)
@@ -1,2 +1,2 @@
 from .generic_operator import make_generic_operator, assign_operation
-from .core import Cell, Propagator, scheduler
+from .core import Cell, Propagator, Network, scheduler, QUIESCENT, EXHAUSTED, ABORTED
@@ -1,16 +1,40 @@
+"""
+Intervals of numbers, as cell contents.
+
+An `Interval` is the knowledge that a number lies between `low` and
+`high`, inclusive. Merging two intervals intersects them, and the
+arithmetic generic operators give the narrowest interval that holds
+every result for numbers in their arguments' intervals. Comparisons
+give True or False when every pair of numbers agrees, and None, which
+is nothing, when they do not.
+
+Intervals are immutable.
+"""
+
 from math import sqrt
 
 from propagator.generic_operator import assign_operation
 from propagator.merging import Contradiction
-from propagator.operator import mul, truediv
+import propagator.operator
 
 class Interval:
+    __slots__ = ("low", "high")
+
     def __init__(self, low, high=None):
-        self.low = low
-        self.high = high is None and low or high
+        _set_low(self, low)
+        _set_high(self, low if high is None else high)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Interval is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Interval is immutable")
+
+    def __reduce__(self):
+        return (Interval, (self.low, self.high))
 
     def __str__(self):
-        return 'Interval({low}, {high})'.format(**vars(self))
+        return 'Interval({0}, {1})'.format(self.low, self.high)
 
     def __unicode__(self):
         return self.__str__()
@@ -22,7 +46,7 @@ class Interval:
         return isinstance(other, Interval) and (self.low == other.low) and (self.high == other.high)
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.low, self.high))
 
     def __and__(self, other):
         return Interval(max(self.low, other.low), min(self.high, other.high))
@@ -33,6 +57,9 @@ class Interval:
     def contains(self, number):
         return self.high >= number >= self.low
 
+_set_low = Interval.low.__set__
+_set_high = Interval.high.__set__
+
 
 def _merge_intervals(content, increment):
     new_range = content & increment
@@ -52,30 +79,27 @@ def _ensure_inside(interval, number):
     else:
         return Contradiction('{number} is not inside {interval}'.format(**vars()))
 
+number_types = (int, float, complex)
+
 def is_number(thing):
-    return isinstance(thing, (int, float, complex))
+    return isinstance(thing, number_types)
 
 def is_interval(thing):
     return isinstance(thing, Interval)
 
 assign_operation("merge",
     _merge_intervals,
-    [is_interval, is_interval]
+    [Interval, Interval]
 )
 
 assign_operation("merge",
     lambda content, increment: _ensure_inside(increment, content),
-    [is_number, is_interval]
+    [number_types, Interval]
 )
 
 assign_operation("merge",
     lambda content, increment: _ensure_inside(content, increment),
-    [is_interval, is_number]
-)
-
-assign_operation("sqrt",
-    lambda i: Interval(sqrt(i.low), sqrt(i.high)),
-    [is_interval]
+    [Interval, number_types]
 )
 
 def coercing(coercer, f):
@@ -88,22 +112,87 @@ def to_interval(thing):
         return Interval(thing)
 
 
-assign_operation("mul",
-    lambda i1, i2: Interval(mul(i1.low, i2.low), mul(i1.high, i2.high)),
-    [is_interval, is_interval]
-)
+def _add_intervals(i1, i2):
+    return Interval(i1.low + i2.low, i1.high + i2.high)
 
-assign_operation("mul",
-    coercing(to_interval, mul),
-    ([is_interval, is_number], [is_number, is_interval])
-)
+def _sub_intervals(i1, i2):
+    return Interval(i1.low - i2.high, i1.high - i2.low)
 
-assign_operation("truediv",
-    lambda i1, i2: mul(i1, Interval(truediv(1, i2.high), truediv(1, i2.low))),
-    [is_interval, is_interval]
-)
+def _mul_intervals(i1, i2):
+    products = (i1.low * i2.low, i1.low * i2.high, i1.high * i2.low, i1.high * i2.high)
+    return Interval(min(products), max(products))
 
-assign_operation("truediv",
-    coercing(to_interval, truediv),
-    ([is_interval, is_number], [is_number, is_interval])
-)
+"""
+Divides `i1` by `i2`. If `i2` contains zero, the quotient may be any
+number, so the result is None.
+"""
+def _truediv_intervals(i1, i2):
+    if i2.contains(0):
+        return None
+    return _mul_intervals(i1, Interval(1 / i2.high, 1 / i2.low))
+
+def _abs_interval(i):
+    if i.low >= 0:
+        return i
+    elif i.high <= 0:
+        return Interval(-i.high, -i.low)
+    else:
+        return Interval(0, max(-i.low, i.high))
+
+def _square_interval(i):
+    i = _abs_interval(i)
+    return Interval(i.low * i.low, i.high * i.high)
+
+def _lt_intervals(i1, i2):
+    if i1.high < i2.low:
+        return True
+    elif i1.low >= i2.high:
+        return False
+    else:
+        return None
+
+def _le_intervals(i1, i2):
+    if i1.high <= i2.low:
+        return True
+    elif i1.low > i2.high:
+        return False
+    else:
+        return None
+
+binary_operations = {
+    "add": _add_intervals,
+    "sub": _sub_intervals,
+    "mul": _mul_intervals,
+    "truediv": _truediv_intervals,
+    "lt": _lt_intervals,
+    "le": _le_intervals,
+    "gt": lambda i1, i2: _lt_intervals(i2, i1),
+    "ge": lambda i1, i2: _le_intervals(i2, i1),
+}
+
+for op_name, op_function in binary_operations.items():
+    assign_operation(op_name,
+        op_function,
+        [Interval, Interval]
+    )
+
+    assign_operation(op_name,
+        coercing(to_interval, op_function),
+        ([Interval, number_types], [number_types, Interval])
+    )
+
+assign_operation("abs", _abs_interval, [Interval])
+
+assign_operation("square", _square_interval, [Interval])
+
+"""
+Takes the square root of `i`. Only its non-negative numbers have square
+roots, so a wholly negative interval gives a contradiction, and the
+others are cut at zero.
+"""
+def _sqrt_interval(i):
+    if i.high < 0:
+        return Contradiction('{i} has no square roots'.format(**vars()))
+    return Interval(sqrt(max(i.low, 0)), sqrt(i.high))
+
+assign_operation("sqrt", _sqrt_interval, [Interval])
@@ -0,0 +1,215 @@
+"""
+Intervals for many scenarios at once.
+
+An `IntervalArray` holds one interval per scenario, with NumPy arrays of
+lows and highs, so that a single propagation through an interval network
+evaluates every scenario. Merging intersects the intervals elementwise;
+scenarios whose intervals do not intersect are marked in the
+`contradictory` mask, and the others go on.
+
+This module needs NumPy.
+
+How to use this module
+----------------------
+
+>>> from propagator.content.interval_array import IntervalArray
+>>> x = Cell('x')
+>>> x.add_content(IntervalArray([1, 2, 3], [2, 3, 4]))
+>>> x.add_content(IntervalArray([1.5, 3.5, 0], [5, 5, 5]))
+>>> x.content
+IntervalArray([1.5 3.5 3. ], [2. 3. 4.], contradictory=[False  True False])
+"""
+
+import numpy
+
+from propagator.generic_operator import assign_operation
+from propagator.content.interval import Interval, number_types
+import propagator.operator
+
+class IntervalArray:
+    """
+    Initialize an `IntervalArray` from sequences (or arrays) of `low` and
+    `high` ends, which default to `low`.
+
+    `contradictory`, if given, is a boolean mask of the scenarios whose
+    intervals are contradictions.
+
+    The arrays are copied, so changing the ones given does not change
+    the `IntervalArray`. Raises `ValueError` if their shapes differ.
+    """
+    def __init__(self, low, high=None, contradictory=None):
+        low = numpy.array(low, dtype=float)
+        high = low.copy() if high is None else numpy.array(high, dtype=float)
+
+        if contradictory is None:
+            contradictory = numpy.zeros(low.shape, dtype=bool)
+        else:
+            contradictory = numpy.array(contradictory, dtype=bool)
+
+        if not low.shape == high.shape == contradictory.shape:
+            raise ValueError("Shapes of low {0}, high {1} and contradictory {2} differ".format(
+                low.shape, high.shape, contradictory.shape))
+
+        self.low = low
+        self.high = high
+        self.contradictory = contradictory
+
+    def __len__(self):
+        return len(self.low)
+
+    def __str__(self):
+        if self.contradictory.any():
+            return 'IntervalArray({0}, {1}, contradictory={2})'.format(self.low, self.high, self.contradictory)
+        else:
+            return 'IntervalArray({0}, {1})'.format(self.low, self.high)
+
+    def __unicode__(self):
+        return self.__str__()
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalArray) and \
+                numpy.array_equal(self.low, other.low) and \
+                numpy.array_equal(self.high, other.high) and \
+                numpy.array_equal(self.contradictory, other.contradictory)
+
+    __hash__ = None
+
+    """
+    Returns the `Interval` of the scenario at `index`.
+    """
+    def __getitem__(self, index):
+        return Interval(self.low[index].item(), self.high[index].item())
+
+"""
+Returns an `IntervalArray` that takes `low`, `high` and `contradictory`,
+arrays of the same shape made by an operation, without copying them.
+"""
+def _interval_array(low, high, contradictory):
+    array = IntervalArray.__new__(IntervalArray)
+    array.low = low
+    array.high = high
+    array.contradictory = contradictory
+    return array
+
+
+"""
+Returns `thing`, a number or an `Interval`, as an `IntervalArray` that
+holds it for every scenario of `like`.
+"""
+def _broadcast(thing, like):
+    if isinstance(thing, Interval):
+        low, high = thing.low, thing.high
+    else:
+        low = high = thing
+
+    shape = like.low.shape
+    return _interval_array(numpy.full(shape, low, dtype=float), numpy.full(shape, high, dtype=float),
+                           numpy.zeros(shape, dtype=bool))
+
+"""
+Intersects the intervals of `content` and `increment` elementwise. The
+scenarios that were already contradictory in `content` keep their
+intervals, so that they stop propagating.
+"""
+def _merge_interval_arrays(content, increment):
+    low = numpy.where(content.contradictory, content.low, numpy.maximum(content.low, increment.low))
+    high = numpy.where(content.contradictory, content.high, numpy.minimum(content.high, increment.high))
+    contradictory = content.contradictory | increment.contradictory | (low > high)
+
+    def same(array):
+        return numpy.array_equal(low, array.low) and numpy.array_equal(high, array.high) and \
+                numpy.array_equal(contradictory, array.contradictory)
+
+    if same(content):
+        return content
+    elif same(increment):
+        return increment
+    else:
+        return _interval_array(low, high, contradictory)
+
+assign_operation("merge",
+    _merge_interval_arrays,
+    [IntervalArray, IntervalArray]
+)
+
+assign_operation("merge",
+    lambda content, increment: _merge_interval_arrays(content, _broadcast(increment, content)),
+    [IntervalArray, number_types + (Interval,)]
+)
+
+assign_operation("merge",
+    lambda content, increment: _merge_interval_arrays(_broadcast(content, increment), increment),
+    [number_types + (Interval,), IntervalArray]
+)
+
+assign_operation("is_contradictory",
+    lambda a: bool(a.contradictory.all()),
+    [IntervalArray]
+)
+
+"""
+Returns a function that applies `f` to two `IntervalArray`s, broadcasting
+numbers and `Interval`s to them.
+"""
+def broadcasting(f):
+    def broadcasting_f(a1, a2):
+        if not isinstance(a1, IntervalArray):
+            a1 = _broadcast(a1, a2)
+        elif not isinstance(a2, IntervalArray):
+            a2 = _broadcast(a2, a1)
+        return f(a1, a2)
+    return broadcasting_f
+
+def _add_interval_arrays(a1, a2):
+    return _interval_array(a1.low + a2.low, a1.high + a2.high, a1.contradictory | a2.contradictory)
+
+def _sub_interval_arrays(a1, a2):
+    return _interval_array(a1.low - a2.high, a1.high - a2.low, a1.contradictory | a2.contradictory)
+
+def _mul_interval_arrays(a1, a2):
+    products = (a1.low * a2.low, a1.low * a2.high, a1.high * a2.low, a1.high * a2.high)
+    return _interval_array(numpy.minimum.reduce(products), numpy.maximum.reduce(products),
+                           a1.contradictory | a2.contradictory)
+
+"""
+Divides `a1` by `a2`. The scenarios whose divisor contains zero may have
+any quotient, so they get unbounded intervals.
+"""
+def _truediv_interval_arrays(a1, a2):
+    zero = (a2.low <= 0) & (a2.high >= 0)
+    with numpy.errstate(divide='ignore'):
+        inverse = _interval_array(1 / a2.high, 1 / a2.low, a2.contradictory)
+    quotient = _mul_interval_arrays(a1, inverse)
+    return _interval_array(numpy.where(zero, -numpy.inf, quotient.low),
+                           numpy.where(zero, numpy.inf, quotient.high),
+                           quotient.contradictory)
+
+binary_operations = {
+    "add": _add_interval_arrays,
+    "sub": _sub_interval_arrays,
+    "mul": _mul_interval_arrays,
+    "truediv": _truediv_interval_arrays,
+}
+
+for name, f in binary_operations.items():
+    assign_operation(name,
+        broadcasting(f),
+        ([IntervalArray, IntervalArray],
+         [IntervalArray, number_types + (Interval,)],
+         [number_types + (Interval,), IntervalArray])
+    )
+
+"""
+Takes the square roots of the intervals of `a`. Only their non-negative
+numbers have square roots, so the scenarios whose intervals are wholly
+negative become contradictory, and the others are cut at zero.
+"""
+def _sqrt_interval_array(a):
+    negative = a.high < 0
+    return _interval_array(numpy.sqrt(numpy.maximum(a.low, 0)), numpy.sqrt(numpy.maximum(a.high, 0)),
+                           a.contradictory | negative)
+
+assign_operation("sqrt", _sqrt_interval_array, [IntervalArray])
@@ -1,36 +1,235 @@
-import operator
-from functools import reduce
+import threading
 
 from propagator.merging import merge, implies, is_contradictory
 from propagator.generic_operator import assign_operation
-from propagator.logging import debug
 from propagator.content.interval import Interval
 import propagator.operator
 
-class Support(set):
+"""
+Premises get interned into consecutive ids, so that supports can be
+bitmasks with one bit per premise.
+"""
+_premise_ids = {}
+_premises = []
+_intern_lock = threading.Lock()
+
+"""
+Returns the bit of `premise` in supports, interning it on first use.
+"""
+def premise_bit(premise):
+    premise_id = _premise_ids.get(premise)
+    if premise_id is None:
+        with _intern_lock:
+            premise_id = _premise_ids.get(premise)
+            if premise_id is None:
+                premise_id = _premise_ids[premise] = len(_premises)
+                _premises.append(premise)
+    return 1 << premise_id
+
+"""
+An immutable set of premises, kept as the bitmask of their interned ids
+in `bits`, so that unions, subset checks and hashing are integer
+operations.
+
+Supports iterate over their premises and print them by name; they pickle
+as their premises, since ids are only meaningful in one process.
+"""
+class Support:
+    __slots__ = ("bits", "_hash")
+
+    def __init__(self, premises=()):
+        bits = 0
+        for premise in premises:
+            bits |= premise_bit(premise)
+        _set_bits(self, bits)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Support is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Support is immutable")
+
+    def __reduce__(self):
+        premises = _support_premises.get(self.bits)
+        if premises is None:
+            premises = _support_premises.setdefault(self.bits, tuple(self))
+        return (Support, (premises,))
+
+    def __iter__(self):
+        bits = self.bits
+        while bits:
+            bit = bits & -bits
+            yield _premises[bit.bit_length() - 1]
+            bits ^= bit
+
+    def __len__(self):
+        return bin(self.bits).count("1")
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __contains__(self, premise):
+        premise_id = _premise_ids.get(premise)
+        return premise_id is not None and bool(self.bits >> premise_id & 1)
+
+    def __or__(self, other):
+        if type(other) is not Support:
+            other = _coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+
+        bits = self.bits | other.bits
+        if bits == self.bits:
+            return self
+        elif bits == other.bits:
+            return other
+        return _support(bits)
+
+    __ror__ = __or__
+
+    def __and__(self, other):
+        if type(other) is not Support:
+            other = _coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+
+        return _support(self.bits & other.bits)
+
+    __rand__ = __and__
+
+    def __eq__(self, other):
+        if isinstance(other, Support):
+            return self.bits == other.bits
+        elif isinstance(other, (set, frozenset)):
+            return set(self) == other
+        else:
+            return NotImplemented
+
+    """
+    Hashes the support as the `frozenset` of its premises, which it is
+    equal to. The hash is computed on first use and kept.
+    """
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            _set_support_hash(self, hash(frozenset(self)))
+            return self._hash
+
+    def __le__(self, other):
+        if type(other) is not Support:
+            other = _coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+
+        return self.bits & other.bits == self.bits
+
+    def __lt__(self, other):
+        if type(other) is not Support:
+            other = _coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+
+        return self.bits != other.bits and self.bits & other.bits == self.bits
+
+    def __ge__(self, other):
+        if type(other) is not Support:
+            other = _coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+
+        return other <= self
+
+    def __gt__(self, other):
+        if type(other) is not Support:
+            other = _coerce(other)
+            if other is NotImplemented:
+                return NotImplemented
+
+        return other < self
+
+    """
+    Tells whether every premise of the support is in `other`, which can
+    be any iterable of premises, like `set.issubset`.
+    """
+    def issubset(self, other):
+        return self <= (other if isinstance(other, Support) else Support(other))
+
     def __str__(self):
-        return "{" + ", ".join(repr(i) for i in self) + "}"
+        return "{" + ", ".join(sorted(map(repr, self))) + "}"
 
     def __unicode__(self):
         return self.__str__()
 
+    def __repr__(self):
+        return "Support(" + self.__str__() + ")"
+
     def more_informative_than(self, other):
-        return self != other and self.issubset(other)
+        return self < other
+
+"""
+The premises of each bitmask that has been pickled, so that supports
+with the same premises pickle the same tuple, which picklers write only
+once.
+"""
+_support_premises = {}
+
+_set_bits = Support.bits.__set__
+_set_support_hash = Support._hash.__set__
+
+"""
+Returns `other` as a `Support` if it is one or a set of premises, or
+`NotImplemented` otherwise, for the operators of `Support`.
+"""
+def _coerce(other):
+    if isinstance(other, Support):
+        return other
+    elif isinstance(other, (set, frozenset)):
+        return Support(other)
+    else:
+        return NotImplemented
+
+"""
+Returns the `Support` whose bitmask is `bits`.
+"""
+def _support(bits):
+    support = object.__new__(Support)
+    _set_bits(support, bits)
+    return support
+
+_empty_support = _support(0)
 
 
-class Supported():
+"""
+A value supported by a set of premises.
+
+`Supported` values are immutable, so they can be shared between cells
+and used as keys; their hash is computed on first use and kept.
+"""
+class Supported:
+    __slots__ = ("value", "support", "_hash")
+
     def __init__(self, value, support=None):
-        self.value = value
+        _set_value(self, value)
 
         if support is None:
-            self.support = Support()
+            _set_support(self, _empty_support)
         elif not isinstance(support, Support):
-            self.support = Support(support)
+            _set_support(self, Support(support))
         else:
-            self.support = support
+            _set_support(self, support)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Supported is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Supported is immutable")
+
+    def __reduce__(self):
+        return (Supported, (self.value, self.support))
 
     def __str__(self):
-        return 'Supported({value}, {support})'.format(**vars(self))
+        return 'Supported({0}, {1})'.format(self.value, self.support)
 
     def __unicode__(self):
         return self.__str__()
@@ -39,69 +238,95 @@ class Supported():
         return self.__str__()
 
     def __eq__(self, other):
+        if other is self:
+            return True
         return isinstance(other, Supported) and \
-                self.value == other.value and \
-                self.support == other.support
+                self.support.bits == other.support.bits and \
+                (self.value is other.value or self.value == other.value)
 
+    """
+    Hashes the value and the support. Values that cannot be hashed, like
+    `IntervalArray`s, are hashed by their `repr`.
+    """
     def __hash__(self):
-        return hash(repr(self))
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+
+        try:
+            value_hash = hash(self.value)
+        except TypeError:
+            value_hash = hash(repr(self.value))
+
+        _set_hash(self, hash((value_hash, self.support.bits)))
+        return self._hash
 
     def subsumes(self, other):
         assert is_supported(other)
         return implies(self.value, other.value) and self.support.issubset(other.support)
 
+_set_value = Supported.value.__set__
+_set_support = Supported.support.__set__
+_set_hash = Supported._hash.__set__
+
 
 def _merge_supporteds(content, increment):
+    if increment is content:
+        return content
+
     merged_value = merge(content.value, increment.value)
 
-    if merged_value == content.value:
-        if implies(increment.value, merged_value):
-            # Confirmation of existing information
-            if increment.support.more_informative_than(content.support):
-                return increment
-            else:
-                return content
+    if merged_value is content.value:
+        if increment.support.more_informative_than(content.support) and \
+                implies(increment.value, merged_value):
+            # Confirmation of existing information, with fewer premises
+            return increment
         else:
-            # New information is not interesting
+            # Confirmation of existing information, or new information
+            # that is not interesting
             return content
-    elif merged_value == increment.value:
+    elif merged_value is increment.value:
         # New information overrides old information
         return increment
     else:
         # Interesting merge, need both provenances
         return Supported(merged_value, content.support | increment.support)
 
+flat_types = (int, float, complex, Interval)
+
 def is_flat(thing):
-    return isinstance(thing, (int, float, complex, Interval))
+    return isinstance(thing, flat_types)
 
 def is_supported(thing):
     return isinstance(thing, Supported)
 
 assign_operation("is_nothing",
     lambda t: t.value is None,
-    [is_supported]
+    [Supported]
 )
 
 assign_operation("merge",
     _merge_supporteds,
-    [is_supported, is_supported]
+    [Supported, Supported]
 )
 
 assign_operation("merge",
     lambda s, f: _merge_supporteds(s, Supported(f)),
-    [is_supported, is_flat]
+    [Supported, flat_types]
 )
 
 assign_operation("merge",
     lambda f, s: _merge_supporteds(Supported(f), s),
-    [is_flat, is_supported]
+    [flat_types, Supported]
 )
 
 def supported_unpacking(function):
     def merge_supports(*supporteds):
-        supports = [supported.support for supported in supporteds]
-        merged_sets = reduce(operator.or_, supports, set())
-        return Support(merged_sets)
+        bits = 0
+        for supported in supporteds:
+            bits |= supported.support.bits
+        return _support(bits)
 
     return lambda *args: Supported( \
         function(*[arg.value for arg in args]),
@@ -123,24 +348,24 @@ operator_functions = { name: getattr(propagator.operator, name) for name in oper
 for op_name, op_function in operator_functions.items():
     assign_operation(op_name,
         supported_unpacking(op_function),
-        [is_supported, is_supported]
+        [Supported, Supported]
     )
 
         #lambda s, f, func=op_function: func(s.value, f),
     assign_operation(op_name,
         coercing(to_supported, supported_unpacking(op_function)),
-        [is_supported, is_flat]
+        [Supported, flat_types]
     )
 
         #lambda f, s, func=op_function: func(f, s.value),
     assign_operation(op_name,
         coercing(to_supported, supported_unpacking(op_function)),
-        [is_flat, is_supported]
+        [flat_types, Supported]
     )
 
-assign_operation("sqrt", supported_unpacking(propagator.operator.sqrt), [is_supported]) 
+assign_operation("sqrt", supported_unpacking(propagator.operator.sqrt), [Supported]) 
 
 assign_operation("is_contradictory",
     lambda s: is_contradictory(s.value),
-    [is_supported]
+    [Supported]
 )
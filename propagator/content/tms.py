@@ -0,0 +1,360 @@
+"""
+Truth maintenance systems, as cell contents.
+
+A `TMS` keeps all the alternative `Supported` values a cell has learned,
+instead of only the one that is believed now. Which of them are believed
+depends on the worldview of the network: the premises that have been
+kicked out with `kick_out` are not believed until they are brought back
+in with `bring_in`, and neither are the values that depend on them.
+Every other premise is believed.
+
+Each scheduler, and so each `Network`, has its own worldview, returned
+by `worldview_of`. `kick_out` and `bring_in` change the worldview of the
+network they are given, or of the current scheduler. Cells merge their
+`TMS`es in the worldview of their own network; outside of it, give that
+worldview to `TMS.consequence` to read one.
+
+Propagators read a `TMS` through its strongest consequence, the merge of
+its believed values, which is kept until the worldview changes. Reading
+one also records the propagator as a reader of the premises of the
+`TMS`, so that flipping a premise alerts only the propagators that read
+values depending on it, instead of the whole network. Propagators that
+look at their cells' contents themselves, instead of through generic
+operators, must read `TMS`es with `tms_query` to be alerted.
+
+This is the system of section 6.3 of The Art of the Propagator,
+"Dependencies for Alternate Worldviews".
+
+How to use this module
+----------------------
+
+>>> from propagator.content.tms import TMS, kick_out, bring_in
+>>> x = Cell('x')
+>>> x.add_content(TMS([Supported(Interval(1, 3), {'rough'})]))
+>>> x.add_content(TMS([Supported(Interval(2, 3), {'fine'})]))
+>>> x.content.consequence()
+Supported(Interval(2, 3), {'fine'})
+>>> kick_out('fine')
+>>> x.content.consequence()
+Supported(Interval(1, 3), {'rough'})
+"""
+
+import threading
+from weakref import WeakKeyDictionary, ref
+
+from propagator.core import current_scheduler
+from propagator.generic_operator import assign_operation
+from propagator.merging import merge, is_contradictory
+from propagator.content.supported import Supported, premise_bit, flat_types, to_supported
+from propagator.util import WeakOrderedSet
+import propagator.operator
+
+"""
+The premises that are believed, and the propagators that read values
+depending on each premise.
+
+Premises are believed unless they are kicked out. Every change of the
+worldview increments its `stamp`, which tells `TMS`es that the strongest
+consequences they keep are out of date.
+
+Propagators run by a `ParallelScheduler` read from several threads, so
+the readers are kept under a lock.
+"""
+class Worldview:
+    def __init__(self):
+        self.disbelieved = 0
+        self.stamp = 0
+        self._readers = {}
+        self._lock = threading.Lock()
+
+    """
+    Tells whether every premise in `support` is believed.
+    """
+    def believes(self, support):
+        return not support.bits & self.disbelieved
+
+    def is_believed(self, premise):
+        return not premise_bit(premise) & self.disbelieved
+
+    """
+    Stops believing `premise`, and alerts the propagators that read
+    values depending on it.
+    """
+    def kick_out(self, premise):
+        bit = premise_bit(premise)
+        with self._lock:
+            if self.disbelieved & bit:
+                return
+            self.disbelieved |= bit
+        self._changed(bit)
+
+    """
+    Believes `premise` again, and alerts the propagators that read
+    values depending on it.
+    """
+    def bring_in(self, premise):
+        bit = premise_bit(premise)
+        with self._lock:
+            if not self.disbelieved & bit:
+                return
+            self.disbelieved &= ~bit
+        self._changed(bit)
+
+    def _changed(self, bit):
+        with self._lock:
+            self.stamp += 1
+            readers = self._readers.get(bit)
+            readers = () if readers is None else list(readers)
+        for propagator in readers:
+            propagator.scheduler.alert_neighbors((propagator,))
+
+    """
+    Records `propagator` as a reader of the premises in `bits`, a
+    support's bitmask.
+    """
+    def read(self, bits, propagator):
+        with self._lock:
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                readers = self._readers.get(bit)
+                if readers is None:
+                    readers = self._readers[bit] = WeakOrderedSet()
+                readers.add(propagator)
+
+    """
+    Believes every premise again, without alerting anything.
+    """
+    def reset(self):
+        with self._lock:
+            self.disbelieved = 0
+            self.stamp += 1
+            self._readers.clear()
+
+_worldviews = WeakKeyDictionary()
+_worldviews_lock = threading.Lock()
+_last_worldview = (lambda: None, None)
+
+"""
+Returns the `Worldview` of `network`, a `Network` or a scheduler, which
+defaults to the current scheduler. It is made the first time it is
+asked for.
+
+The last one returned is kept with a weak reference to its scheduler,
+since reading `TMS`es asks for the same one over and over.
+"""
+def worldview_of(network=None):
+    global _last_worldview
+
+    if network is None:
+        scheduler = current_scheduler()
+    else:
+        scheduler = getattr(network, "scheduler", network)
+
+    last_scheduler, worldview = _last_worldview
+    if last_scheduler() is scheduler:
+        return worldview
+
+    worldview = _worldviews.get(scheduler)
+    if worldview is None:
+        with _worldviews_lock:
+            worldview = _worldviews.get(scheduler)
+            if worldview is None:
+                worldview = _worldviews[scheduler] = Worldview()
+    _last_worldview = (ref(scheduler), worldview)
+    return worldview
+
+"""
+Stops believing `premise` in the worldview of `network`, which defaults
+to the current scheduler.
+"""
+def kick_out(premise, network=None):
+    worldview_of(network).kick_out(premise)
+
+"""
+Believes `premise` again in the worldview of `network`, which defaults
+to the current scheduler.
+"""
+def bring_in(premise, network=None):
+    worldview_of(network).bring_in(premise)
+
+
+"""
+A set of alternative `Supported` values, none of which subsumes another.
+
+`TMS`es are not changed once made, apart from the strongest consequence
+they keep for the last worldview they were read in.
+"""
+class TMS:
+    __slots__ = ("values", "bits", "_worldview", "_stamp", "_consequence")
+
+    def __init__(self, values=()):
+        self.values = tuple(values)
+        bits = 0
+        for supported in self.values:
+            bits |= supported.support.bits
+        self.bits = bits
+        self._worldview = None
+        self._stamp = None
+        self._consequence = None
+
+    def __reduce__(self):
+        return (TMS, (self.values,))
+
+    def __str__(self):
+        return 'TMS([{0}])'.format(", ".join(map(str, self.values)))
+
+    def __unicode__(self):
+        return self.__str__()
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __eq__(self, other):
+        return other is self or isinstance(other, TMS) and set(self.values) == set(other.values)
+
+    def __hash__(self):
+        return hash(frozenset(self.values))
+
+    """
+    Returns the merge of the values believed in `worldview`, which
+    defaults to the worldview of the current scheduler: a `Supported`
+    value, or None if none is believed.
+    """
+    def consequence(self, worldview=None):
+        if worldview is None:
+            worldview = worldview_of()
+
+        stamp = worldview.stamp
+        if self._worldview is not worldview or self._stamp != stamp:
+            consequence = None
+            believes = worldview.believes
+            for supported in self.values:
+                if believes(supported.support):
+                    consequence = merge(consequence, supported)
+            self._consequence = consequence
+            self._worldview = worldview
+            self._stamp = stamp
+        return self._consequence
+
+"""
+Returns the strongest consequence of `tms` in the worldview of the
+current scheduler, and records the running propagator, if any, as a
+reader of its premises.
+"""
+def tms_query(tms):
+    scheduler = current_scheduler()
+    worldview = worldview_of(scheduler)
+    propagator = scheduler.current_propagator
+    if propagator is not None:
+        worldview.read(tms.bits, propagator)
+    return tms.consequence(worldview)
+
+"""
+Returns `values` with `supported` added, unless one of them subsumes it,
+in which case `values` itself is returned; the values `supported`
+subsumes are dropped.
+"""
+def _assimilate(values, supported):
+    if supported.value is None:
+        return values
+    for old in values:
+        if old.subsumes(supported):
+            return values
+    return tuple(old for old in values if not supported.subsumes(old)) + (supported,)
+
+def to_tms(thing):
+    if isinstance(thing, TMS):
+        return thing
+    elif isinstance(thing, Supported):
+        return TMS((thing,))
+    else:
+        return TMS((Supported(thing),))
+
+def _merge_tmses(content, increment):
+    values = content.values
+    for supported in increment.values:
+        values = _assimilate(values, supported)
+
+    candidate = content if values is content.values else TMS(values)
+    consequence = candidate.consequence()
+    if consequence is not None:
+        values = _assimilate(values, consequence)
+
+    if values is content.values:
+        return content
+    elif values is candidate.values:
+        return candidate
+    else:
+        return TMS(values)
+
+tms_operands = flat_types + (Supported,)
+
+assign_operation("merge",
+    _merge_tmses,
+    [TMS, TMS]
+)
+
+assign_operation("merge",
+    lambda content, increment: _merge_tmses(content, to_tms(increment)),
+    [TMS, tms_operands]
+)
+
+assign_operation("merge",
+    lambda content, increment: _merge_tmses(to_tms(content), increment),
+    [tms_operands, TMS]
+)
+
+assign_operation("is_nothing",
+    lambda tms: tms.consequence() is None,
+    [TMS]
+)
+
+assign_operation("is_contradictory",
+    lambda tms: is_contradictory(tms.consequence()),
+    [TMS]
+)
+
+"""
+Returns a function that applies `function` to the strongest consequences
+of its `TMS` arguments, and returns the result as a `TMS`, or None if any
+of them has no consequence or the result is None.
+"""
+def tms_unpacking(function):
+    def unpacked(*args):
+        values = [tms_query(arg) if isinstance(arg, TMS) else arg for arg in args]
+        if None in values:
+            return None
+        result = function(*values)
+        return None if result is None else to_tms(result)
+    return unpacked
+
+for op_name in ["add", "sub", "mul", "truediv"]:
+    op_function = getattr(propagator.operator, op_name)
+    assign_operation(op_name,
+        tms_unpacking(op_function),
+        ([TMS, TMS], [TMS, tms_operands], [tms_operands, TMS])
+    )
+
+assign_operation("sqrt", tms_unpacking(propagator.operator.sqrt), [TMS])
+
+"""
+Chooses by the strongest consequence of `predicate`, a `TMS`, between
+`if_true` and `if_false`, and returns the strongest consequence of the
+chosen one, supported also by the premises of the predicate, as a `TMS`.
+"""
+def _choose_tms(predicate, if_true, if_false):
+    condition = tms_query(predicate)
+    if condition is None:
+        return None
+
+    chosen = if_true if condition.value else if_false
+    if isinstance(chosen, TMS):
+        chosen = tms_query(chosen)
+    if chosen is None:
+        return None
+
+    chosen = to_supported(chosen)
+    return to_tms(Supported(chosen.value, condition.support | chosen.support))
+
+assign_operation("choose", _choose_tms, [TMS, object, object])
@@ -6,17 +6,53 @@ Classes defined in this module:
 
 - `Cell`
 - `Propagator`
+- `CompoundPropagator`
 - `Scheduler`
+- `Network`
 
-This module uses `propagator.scheduler`, a `Scheduler` object
-that manages the propagator alerts.
+Every cell and propagator is bound to the `Scheduler` that manages its
+alerts. By default it is `propagator.scheduler`, a module-level
+`Scheduler` object; a `Network` owns its own scheduler, so independent
+networks can be built and run separately, even on different threads.
 """
 
-from collections import deque
+import asyncio
+import inspect
+import time
+from contextvars import ContextVar
+from itertools import count
+
+from propagator.merging import merge_changed, is_contradictory
+from propagator.scheduling import FIFOPolicy
+from propagator.util import WeakOrderedSet, listify, all_none
+
+"""
+Statuses returned by `Scheduler.run`.
+"""
+QUIESCENT = "quiescent"
+EXHAUSTED = "exhausted"
+ABORTED = "aborted"
+
+"""
+Raised by `Scheduler.abort_process` to unwind a run back to
+`Scheduler.run`.
+
+It derives from `BaseException`, so that propagators catching
+`Exception` do not swallow it.
+"""
+class AbortProcess(BaseException):
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = value
+
+
+"""
+Tells whether `propagator` has neither input nor output cells, so that
+nothing but the scheduler references it.
+"""
+def _has_no_cells(propagator):
+    return not getattr(propagator, "neighbors", True) and not propagator.outputs
 
-from propagator.merging import merge
-from propagator.util import SetQueue, listify, all_none, callcc
-from propagator.logging import debug, error
 
 """
 A scheduler that stores propagators in a queue ("alerts" them) and runs
@@ -25,23 +61,70 @@ them until there are no propagators left.
 Each propagator, when ran, may alert other propagators, so this process
 will continue until the propagator network stabilizes.
 
+The queue of alerted propagators is a scheduling policy (see
+`propagator.scheduling`), which decides in which order they are run.
+A `propagator.profiling.Profiler` can be set as the `profiler` attribute
+to measure each propagator it runs, a `propagator.recording.Recorder`
+can be set as the `recorder` attribute to log every content added to
+its cells, and a `propagator.tracing.Tracer` can be set as the `tracer`
+attribute to follow its events.
+
+While a propagator runs, it is the scheduler's `current_propagator`.
+Cells and propagators get sequential `id`s from their scheduler, so a
+network built in the same order gets the same ids.
+
+Every propagator alerted is remembered in `propagators_ever_alerted`,
+which only references them weakly: the scheduler does not keep alive
+the parts of a network, such as the subnetworks of compound
+propagators, that are no longer reachable. Propagators without input
+cells are kept alive by their output cells instead (see `Cell`), or,
+if they have none, referenced strongly.
+
+Parameters:
+
+- `policy`: the policy to use; defaults to a `FIFOPolicy`.
 """
 class Scheduler:
-    def __init__(self):
-        self.alerted_propagators = SetQueue()
-        self.propagators_ever_alerted = SetQueue()
-        self._abort_process_stack = deque()
+    cell_locks = None
+    clock_check_interval = 64
+    profiler = None
+    recorder = None
+    tracer = None
+
+    def __init__(self, policy=None):
+        self.alerted_propagators = FIFOPolicy() if policy is None else policy
+        self.propagators_ever_alerted = WeakOrderedSet(keep=_has_no_cells)
+        self._run_depth = 0
+        self._batch = None
+        self._cell_ids = count()
+        self._propagator_ids = count()
+        self.current_propagator = None
         self.last_value_of_run = None
+        self.status = QUIESCENT
+        self.waves = 0
+        self.firings = 0
 
     """
     Initialize the scheduler, emptying its queues and registers.
+
+    Parameters:
+
+    - `policy`: if provided, the scheduling policy to use from now on.
     """
-    def initialize(self):
-        debug("Initializing scheduler")
-        self.alerted_propagators.clear()
+    def initialize(self, policy=None):
+        if self.tracer is not None:
+            self.tracer.initialized(self)
+        if policy is not None:
+            self.alerted_propagators = policy
+        self.alerted_propagators.reset()
         self.propagators_ever_alerted.clear()
-        self._abort_process_stack.clear()
+        self._cell_ids = count()
+        self._propagator_ids = count()
+        self.current_propagator = None
         self.last_value_of_run = None
+        self.status = QUIESCENT
+        self.waves = 0
+        self.firings = 0
 
 
     """
@@ -53,56 +136,441 @@ class Scheduler:
       `Propagators objects.
     """
     def alert_propagators(self, propagators):
-        for p in listify(propagators):
+        self.alert_neighbors(listify(propagators))
+
+    """
+    Alerts each propagator in `neighbors`, an iterable of propagators
+    such as a cell's `neighbors`.
+
+    Unlike `alert_propagators`, it iterates over `neighbors` as it is,
+    without copying it into a list, so cells with many neighbors alert
+    them cheaply.
+    """
+    def alert_neighbors(self, neighbors):
+        if self._batch is not None:
+            self._batch.defer(neighbors)
+            return
+
+        ever_alerted = self.propagators_ever_alerted.add
+        alert = self.alerted_propagators.add
+        for p in neighbors:
             assert callable(p), "Alerting a non-procedure"
-            self.propagators_ever_alerted.add(p)
-            self.alerted_propagators.add(p)
+            ever_alerted(p)
+            alert(p)
 
     def alert_all_propagators(self):
         self.alert_propagators(self.propagators_ever_alerted)
 
+    """
+    Returns a `Batch` context manager that defers alerts until it exits.
+
+    Parameters:
+
+    - `atomic`: if true, the whole batch is rolled back if any content
+      added in it is contradictory.
+    """
+    def batch(self, atomic=False):
+        return Batch(self, atomic)
+
+    """
+    Stops the propagation, dropping all alerted propagators.
+
+    If called while the scheduler is running, it raises `AbortProcess`,
+    which unwinds the running propagator and makes `run` return
+    `ABORTED`, with `value` stored in `last_value_of_run`. Otherwise,
+    `value` is just stored as the value of the last run.
+    """
     def abort_process(self, value):
         self.alerted_propagators.clear()
-        #error("Aborting: {value}".format(**vars()))
-        if self._abort_process_stack:
-            self._abort_process_stack.pop()(value)
+        if self._run_depth:
+            raise AbortProcess(value)
         else:
             self.last_value_of_run = value
 
     """
-    Pops and runs alerted propagators from the queue them until it is
-    empty.
-    """
-    def run(self):
-        def with_process_abortion(thunk):
-            def f(k):
-                self._abort_process_stack.append(k)
-                thunk()
-                self._abort_process_stack.pop()
+    Pops and runs alerted propagators from the queue until it is empty.
+
+    The queue is drained in waves, as chosen by the scheduling policy:
+    with the default `FIFOPolicy`, each wave runs the propagators that
+    were alerted when it started, and the propagators they alert are run
+    in the next wave. Waves are processed iteratively, so the stack
+    depth does not grow with the length of the propagation.
+
+    After the run, `waves` and `firings` hold how many waves and
+    propagator calls it took.
 
-            return callcc(f)
+    The run can be given a budget, so that it stops before the network
+    is quiescent. The propagators that were not fired are put back at
+    the front of the queue, so the next call resumes where this one
+    stopped.
 
-        def run_alerted():
-            temp = list(self.alerted_propagators)
-            self.alerted_propagators.clear()
-            for propagator in list(temp):
-                debug("Running {propagator}".format(**vars()))
-                propagator()
+    Parameters:
+
+    - `max_firings`: the maximum number of propagators to fire.
+    - `deadline`: a `time.monotonic()` value after which no propagator
+      is fired. The clock is checked every `clock_check_interval`
+      firings.
+
+    Returns the status of the run, also stored in `status`:
+
+    - `QUIESCENT` if there are no alerted propagators left;
+    - `EXHAUSTED` if the budget ran out first;
+    - `ABORTED` if `abort_process` was called. The value it was called
+      with is stored in `last_value_of_run`, which is `None` otherwise.
+    """
+    def run(self, max_firings=None, deadline=None):
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.run_started(self)
+
+        self.waves = 0
+        self.firings = 0
+        self.status = QUIESCENT
+        alerted = self.alerted_propagators
+
+        if alerted:
+            self._run_depth += 1
+            _activate(self)
+            try:
+                if max_firings is None and deadline is None:
+                    while alerted:
+                        self.waves += 1
+                        self.run_wave(alerted.next_wave())
+                else:
+                    self._run_with_budget(max_firings, deadline)
+                self.last_value_of_run = None
+            except AbortProcess as abort:
+                self.last_value_of_run = abort.value
+                self.status = ABORTED
+            finally:
+                self.current_propagator = None
+                _deactivate()
+                self._run_depth -= 1
+
+        if tracer is not None:
+            tracer.run_finished(self, self.status)
+
+        return self.status
+
+    def _run_with_budget(self, max_firings, deadline):
+        alerted = self.alerted_propagators
+        interval = self.clock_check_interval
+
+        while alerted:
+            wave = alerted.next_wave()
+            self.waves += 1
+            start = 0
+
+            while start < len(wave):
+                size = len(wave) - start
+                if max_firings is not None:
+                    size = min(size, max_firings - self.firings)
+                if deadline is not None:
+                    size = min(size, interval) if time.monotonic() < deadline else 0
+
+                if size <= 0:
+                    alerted.requeue(wave[start:])
+                    self.status = EXHAUSTED
+                    return
+
+                self.run_wave(wave[start:start + size])
+                start += size
+
+    """
+    Runs each propagator of `wave`, in order.
 
-            if self.alerted_propagators:
-                run_alerted()
+    Propagators with `async def` bodies can only be run by `run_async`.
+    """
+    def run_wave(self, wave):
+        profiler = self.profiler
+        tracer = self.tracer
+        for propagator in wave:
+            if tracer is not None:
+                tracer.fired(propagator)
+            self.firings += 1
+            self.current_propagator = propagator
+            result = propagator() if profiler is None else profiler.fire(propagator)
+            if result is not None:
+                _refuse_awaitable(propagator, result)
+        self.current_propagator = None
 
-        debug("Running scheduler")
+    """
+    Runs alerted propagators until the network is quiescent, like `run`,
+    awaiting the propagators whose bodies are `async def` functions.
 
-        if len(self.alerted_propagators):
-            self.last_value_of_run = with_process_abortion(run_alerted)
+    Asynchronous propagators are started as asyncio tasks as soon as they
+    are fired, so many of them can be waiting at once while the others
+    keep running. Each of them is the `current_propagator` while one of
+    its steps runs, so the content it adds after an `await` is still
+    attributed to it. The network is quiescent when the queue is empty and
+    no task is left; if a task fails, the others are cancelled and the
+    exception is raised.
 
-        debug("Scheduler done")
+    Propagators are fired one at a time, whatever `run_wave` does.
 
-        return self.last_value_of_run
+    Returns the status of the run, as `run` does; runs cannot be given a
+    budget.
+    """
+    async def run_async(self):
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.run_started(self)
+
+        self.waves = 0
+        self.firings = 0
+        self.status = QUIESCENT
+        alerted = self.alerted_propagators
+        in_flight = set()
+
+        self._run_depth += 1
+        _activate(self)
+        try:
+            while alerted or in_flight:
+                while alerted:
+                    self.waves += 1
+                    profiler = self.profiler
+                    for propagator in alerted.next_wave():
+                        if tracer is not None:
+                            tracer.fired(propagator)
+                        self.firings += 1
+                        self.current_propagator = propagator
+                        result = propagator() if profiler is None else profiler.fire(propagator)
+                        self.current_propagator = None
+                        if result is not None and inspect.isawaitable(result):
+                            in_flight.add(asyncio.ensure_future(_Attributed(self, propagator, result)))
+
+                if in_flight:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+            self.last_value_of_run = None
+        except AbortProcess as abort:
+            self.last_value_of_run = abort.value
+            self.status = ABORTED
+        finally:
+            for task in in_flight:
+                task.cancel()
+            self.current_propagator = None
+            _deactivate()
+            self._run_depth -= 1
+
+        if tracer is not None:
+            tracer.run_finished(self, self.status)
+
+        return self.status
 
 scheduler = Scheduler()
 
+"""
+Awaits `awaitable`, the result of firing `propagator`, one step at a
+time, making `propagator` the scheduler's `current_propagator` while
+each step runs.
+"""
+class _Attributed:
+    __slots__ = ("scheduler", "propagator", "awaitable")
+
+    def __init__(self, scheduler, propagator, awaitable):
+        self.scheduler = scheduler
+        self.propagator = propagator
+        self.awaitable = awaitable
+
+    def __await__(self):
+        steps = self.awaitable.__await__()
+        resume, message = steps.send, None
+
+        while True:
+            self.scheduler.current_propagator = self.propagator
+            try:
+                signal = resume(message)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.scheduler.current_propagator = None
+
+            try:
+                message = yield signal
+            except BaseException as error:
+                resume, message = steps.throw, error
+            else:
+                resume = steps.send
+
+"""
+Raises `TypeError` if `result`, returned by firing `propagator`, is
+awaitable, after closing it: propagators with `async def` bodies can
+only be run by `run_async`.
+"""
+def _refuse_awaitable(propagator, result):
+    if inspect.isawaitable(result):
+        if hasattr(result, "close"):
+            result.close()
+        raise TypeError("{propagator} is asynchronous; use run_async()".format(**vars()))
+
+"""
+A group of updates whose alerts are coalesced.
+
+While a batch is open on a scheduler, propagators alerted by its cells
+(or by new propagators) are only collected. When the batch exits, each
+of them is alerted exactly once, so that loading many input cells does
+not alert their shared neighbors once per cell.
+
+If the batch is `atomic`, it remembers the content each cell had before
+its first change. If any change in the batch makes a cell contradictory,
+or if the block raises an exception, every changed cell gets its old
+content back and the collected alerts are dropped; `rolled_back` is then
+true and `contradictions` lists the contradictory cells.
+
+If the block of a batch that is not atomic raises an exception, the
+content it added is kept, but the collected alerts are dropped, so that
+a partial update is not propagated.
+
+Dropping alerts never drops the first alert of a propagator created in
+the batch, so that it still runs once, like any new propagator.
+
+>>> with scheduler.batch(atomic=True) as batch:
+...     for cell, reading in zip(inputs, frame):
+...         cell.add_content(reading)
+>>> batch.rolled_back
+False
+"""
+class Batch:
+    def __init__(self, scheduler, atomic=False):
+        self.scheduler = scheduler
+        self.atomic = atomic
+        self.pending = {}
+        self.previous = {}
+        self.contradictions = []
+        self.rolled_back = False
+
+    def __enter__(self):
+        assert self.scheduler._batch is None, "Batches cannot be nested"
+        self.scheduler._batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.scheduler._batch = None
+
+        if self.atomic and (exc_type is not None or self.contradictions):
+            self.rollback()
+        elif exc_type is not None:
+            self.discard()
+        else:
+            self.commit()
+
+    """
+    Collects the propagators in `propagators`, an iterable.
+    """
+    def defer(self, propagators):
+        for p in propagators:
+            self.pending[p] = None
+
+    """
+    Records that `cell` is about to get `content`; only used by atomic
+    batches.
+    """
+    def changing(self, cell, content):
+        if cell not in self.previous:
+            self.previous[cell] = cell.content
+        if is_contradictory(content):
+            self.contradictions.append(cell)
+
+    def commit(self):
+        self.scheduler.alert_neighbors(self.pending)
+        self.pending.clear()
+
+    """
+    Drops the collected alerts, except those of the propagators that
+    were created in the batch, which are alerted.
+    """
+    def discard(self):
+        ever_alerted = self.scheduler.propagators_ever_alerted
+        created = [p for p in self.pending if p not in ever_alerted]
+        self.pending.clear()
+        self.scheduler.alert_neighbors(created)
+
+    def rollback(self):
+        recorder = self.scheduler.recorder
+        for cell, content in self.previous.items():
+            cell.content = content
+            if recorder is not None:
+                recorder.restored(cell, content)
+        self.discard()
+        self.rolled_back = True
+
+
+_active = ContextVar("active_schedulers", default=())
+
+"""
+Returns the scheduler that new cells and propagators are bound to in the
+current thread or asyncio task.
+
+It is the scheduler of the innermost `Network` entered with `with`, or
+the scheduler that is running (so that compound propagators build their
+subnetworks in the right place), or `propagator.scheduler` otherwise.
+"""
+def current_scheduler():
+    schedulers = _active.get()
+    return schedulers[-1] if schedulers else scheduler
+
+def _activate(s):
+    _active.set(_active.get() + (s,))
+
+def _deactivate():
+    _active.set(_active.get()[:-1])
+
+
+"""
+A propagator network with its own `Scheduler`.
+
+Cells and propagators created inside a `with network:` block are bound
+to the network's scheduler instead of the module-level one:
+
+>>> network = Network()
+>>> with network:
+...     a, b = Cell('a'), Cell('b')
+...     adder(a, a, b)
+>>> a.add_content(2)
+>>> network.run()
+
+Parameters:
+
+- `policy`: the scheduling policy of the network's scheduler.
+- `scheduler`: a scheduler to use instead of a new `Scheduler`, such as
+  a `propagator.parallel.ParallelScheduler`.
+"""
+class Network:
+    def __init__(self, policy=None, scheduler=None):
+        if scheduler is None:
+            scheduler = Scheduler(policy)
+        elif policy is not None:
+            scheduler.initialize(policy)
+        self.scheduler = scheduler
+
+    def __enter__(self):
+        _activate(self.scheduler)
+        return self
+
+    def __exit__(self, *exc_info):
+        _deactivate()
+
+    """
+    Returns a new `Cell` bound to this network.
+    """
+    def cell(self, name=None, content=None):
+        with self:
+            return Cell(name, content)
+
+    def run(self, max_firings=None, deadline=None):
+        return self.scheduler.run(max_firings, deadline)
+
+    def batch(self, atomic=False):
+        return self.scheduler.batch(atomic)
+
+    async def run_async(self):
+        return await self.scheduler.run_async()
+
+    def initialize(self, policy=None):
+        self.scheduler.initialize(policy)
+
 
 """
 The storage unit of the propagator network.
@@ -110,13 +578,31 @@ The storage unit of the propagator network.
 Each cell may have content, stored in the `content` attribute -- that is
 `None` if there is no content.
 
-Each cell may have neighbors, stored in the `neighbors` attribute. It is
-a list of propagators that are interested in the cell's content.
+Each cell may have neighbors, stored in the `neighbors` attribute: the
+propagators that are interested in the cell's content, in the order
+they were added. It is a tuple, or, once the cell has more than
+`MAX_TUPLE_NEIGHBORS` neighbors, a dictionary whose keys are the
+propagators, so that checking whether a propagator is already a
+neighbor does not scan all of them.
 
 When the cell receives content, it alerts all neighbor propagators, so
-they can update other cells based on this new content.
+they can update other cells based on this new content, using the
+scheduler that was current when the cell was created.
+
+Each cell also keeps, in the `sources` tuple, the propagators without
+input cells that write to it, like those of
+`propagator.primitives.constant`. No cell references them as a
+neighbor, and the scheduler only references propagators weakly, so the
+cell keeps them alive for as long as it lives.
+
+Cells have `__slots__` instead of a `__dict__`, and most of them have
+few neighbors, so a tuple is the most compact way to store them.
 """
 class Cell:
+    __slots__ = ("scheduler", "id", "neighbors", "sources", "name", "content", "__weakref__")
+
+    MAX_TUPLE_NEIGHBORS = 8
+
     """
     Initialize a `Cell` object, with no neighbors.
 
@@ -125,11 +611,15 @@ class Cell:
     - `content`: is provided, it is added as the cell's content.
     """
     def __init__(self, name=None, content=None):
-        self.neighbors = []
+        self.scheduler = current_scheduler()
+        self.id = next(self.scheduler._cell_ids)
+        self.neighbors = ()
+        self.sources = ()
         self.name = name
         self.content = None
         self.add_content(content)
-        debug("New cell: " + str(self))
+        if self.scheduler.tracer is not None:
+            self.scheduler.tracer.new_cell(self)
 
     def __repr__(self):
         return "Cell({name}, {content})".format(name=repr(self.name), content=repr(self.content))
@@ -146,66 +636,138 @@ class Cell:
     The propagator is added only if it isn't already a neighbor.
     """
     def new_neighbor(self, n):
-        if n not in self.neighbors:
-            self.neighbors.append(n)
-            scheduler.alert_propagators(n)
+        neighbors = self.neighbors
+        if n not in neighbors:
+            if type(neighbors) is not tuple:
+                neighbors[n] = None
+            elif len(neighbors) < self.MAX_TUPLE_NEIGHBORS:
+                self.neighbors = neighbors + (n,)
+            else:
+                self.neighbors = dict.fromkeys(neighbors + (n,))
+            self.scheduler.alert_neighbors((n,))
 
     """
-    Add content to the cell and alert its neighbors if the cell is empty.
+    Merge content into the cell and alert its neighbors if that adds
+    information to it.
 
-    If the content to be added is `None` or is equal to the cell's
-    content, nothing is done.
-
-    If there is content in the cell, and it differs from the parameter's
-    content, there is inconsistency in the system; it raises a
-    `ValueError`.
+    If the content to be added is `None`, or if merging it returns the
+    cell's content itself (see `propagator.merging.merge`), nothing is
+    done. Inconsistent content makes the cell's content a
+    `Contradiction`.
 
     Parameters:
 
     - `c`: the content to be added.
+
+    If the cell's scheduler has `cell_locks`, the merge is done while
+    holding the cell's lock, so that propagators running on different
+    threads do not lose each other's content.
+
+    The merge is done with the cell's scheduler as the current one, so
+    that contents which depend on the network, like the worldview of
+    `propagator.content.tms`, are merged in the cell's own network.
     """
     def add_content(self, increment):
-        answer = merge(self.content, increment)
-
-        if answer != self.content:
-            debug("Adding content {1} to {0}".format(self, answer))
+        schedulers = _active.get()
+        if (schedulers[-1] if schedulers else scheduler) is not self.scheduler:
+            token = _active.set(schedulers + (self.scheduler,))
+            try:
+                return self._locked_add_content(increment)
+            finally:
+                _active.reset(token)
+        return self._locked_add_content(increment)
+
+    def _locked_add_content(self, increment):
+        locks = self.scheduler.cell_locks
+        if locks is not None:
+            with locks[hash(self) % len(locks)]:
+                return self._add_content(increment)
+        return self._add_content(increment)
+
+    def _add_content(self, increment):
+        answer, changed = merge_changed(self.content, increment)
+
+        profiler = self.scheduler.profiler
+        if profiler is not None:
+            profiler.added_content(self.scheduler.current_propagator, changed)
+
+        recorder = self.scheduler.recorder
+        if recorder is not None:
+            recorder.record(self, increment, answer)
+
+        if changed:
+            batch = self.scheduler._batch
+            if batch is not None and batch.atomic:
+                batch.changing(self, answer)
             self.content = answer
-            scheduler.alert_propagators(self.neighbors)
+            self.scheduler.alert_neighbors(self.neighbors)
+
+        tracer = self.scheduler.tracer
+        if tracer is not None:
+            tracer.content_added(self, increment, answer, changed)
 
 """
 The machine of the propagator network.
 
 A `Propagator` is a machine that continously examines its input cells and
 produces outputs when possible (i.e. when the inputs have enough information).
+
+Propagators have `__slots__`; subclasses that add attributes must
+declare them in their own `__slots__`.
 """
 class Propagator:
+    __slots__ = ("neighbors", "outputs", "to_do", "name", "scheduler", "id", "__weakref__")
+
     """
     Initialize a `Propagator` object.
 
-    `to_do` is scheduled to be run once by each of the cells in `neighbors`.
+    The propagator is scheduled to be run once by each of the cells in
+    `neighbors`.
 
-    `to_do` is then added as a neighbor to each of them, so it will run
-    again every time one of the cells have its content changed.
+    It is then added as a neighbor to each of them, so it will run
+    again every time one of the cells have its content changed. Running
+    a propagator calls its `to_do` function.
+
+    The propagator is bound to the scheduler of its first neighbor, or
+    to the current scheduler if it has no neighbors.
 
     Parameters:
 
     - `neighbors`: cells that affect this propagator.
     - `to_do`: a function that creates some output based on `neighbors`'
       contents.
+    - `outputs`: cells that `to_do` adds content to, if they are known.
+      They are only used by scheduling policies that look at the shape
+      of the network.
+    - `name`: the name of the propagator in reports; defaults to the name
+      of `to_do`.
     """
-    def __init__(self, neighbors, to_do):
-        for n in neighbors:
-            n.new_neighbor(to_do)
-        scheduler.alert_propagators(to_do)
+    def __init__(self, neighbors, to_do, outputs=(), name=None):
+        self.neighbors = tuple(neighbors)
+        self.outputs = tuple(outputs)
+        self.to_do = to_do
+        self.name = getattr(to_do, "__name__", "propagator") if name is None else name
+        self.scheduler = self.neighbors[0].scheduler if self.neighbors else current_scheduler()
+        self.id = next(self.scheduler._propagator_ids)
+
+        for n in self.neighbors:
+            n.new_neighbor(self)
+        if not self.neighbors:
+            for cell in self.outputs:
+                cell.sources += (self,)
+        self.scheduler.alert_neighbors((self,))
+
+    def __call__(self):
+        return self.to_do()
 
     def __str__(self):
-        return "<Propagator: {to_do} ({id})>".format(id=id(self), **vars(self))
+        return "<Propagator: {name} ({id})>".format(name=self.name, id=id(self))
 
     def __unicode__(self):
         return self.__str__()
 
     """
-    Returns a `Propagator` object that constructs its body on demand.
+    Returns a `CompoundPropagator` that constructs its body on demand.
 
     Parameters:
 
@@ -215,13 +777,38 @@ class Propagator:
     """
     @classmethod
     def compound(cls, neighbors, to_build):
-        done = False
+        return CompoundPropagator(neighbors, to_build)
+
+
+_builds = count(1)
 
-        def compound_helper():
-            nonlocal done
-            if not done:
-                if not all_none(n.content for n in neighbors):
-                    done = True
-                    to_build()
+"""
+A propagator that builds a subnetwork the first time it runs with
+content in any of its neighbors, by calling its `to_do` function.
+
+Its `built` attribute is false until the subnetwork is built; then it
+is a number that grows with each compound propagator built, so that
+they can be built again in the same order (see `propagator.snapshot`).
+"""
+class CompoundPropagator(Propagator):
+    __slots__ = ("built",)
+
+    def __init__(self, neighbors, to_build):
+        self.built = False
+        super().__init__(neighbors, to_build,
+                name="compound({0})".format(getattr(to_build, "__name__", "propagator")))
 
-        return Propagator(neighbors, compound_helper)
+    def __call__(self):
+        if not self.built and not all_none(n.content for n in self.neighbors):
+            self.build()
+
+    """
+    Builds the subnetwork, in the propagator's scheduler.
+    """
+    def build(self):
+        self.built = next(_builds)
+        _activate(self.scheduler)
+        try:
+            self.to_do()
+        finally:
+            _deactivate()
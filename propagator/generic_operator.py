@@ -17,17 +17,116 @@ hello world
 >>> assign_operation("concat", concat_numbers, (is_number, is_number))
 >>> concat(1, 2)
 12
+
+Dispatch cache
+--------------
+
+Generic operators cache the operation they choose for each tuple of
+argument types, so that calling them does not run every test again.
+Only classes, and tests marked with `type_predicate`, are trusted to
+depend on nothing but the types of the arguments, so only they are
+cached:
+
+>>> is_number = type_predicate(lambda x: isinstance(x, (int, float, complex)))
+
+Other tests may look at the values of the arguments, or call other
+generic operators, like `propagator.merging.is_nothing`; they are run
+on each call, after the ones that depend only on types.
+
+Class-based operations
+----------------------
+
+Instead of a test, an argument can be given a class, or a tuple of
+classes, that it must be an instance of:
+
+>>> assign_operation("concat", concat_numbers, ((int, float), (int, float)))
+
+Operations assigned only with classes are indexed by them, so choosing
+one is a dictionary lookup for each combination of classes in the method
+resolution orders of the arguments' types: the most specific classes
+win, those of the first argument before those of the others. They take
+precedence over operations assigned with tests, which are only tried
+when no classes match; assigning the same classes again replaces their
+operation.
+
+Applying to many arguments
+--------------------------
+
+`apply_many` (or `map`) applies a generic operator to a sequence of
+argument tuples, choosing the operation once for each combination of
+types. Operations can be assigned with a vectorized implementation,
+which receives one list per argument and is then called once for all
+the tuples it applies to:
+
+>>> concat.map([(1, 2), ("a", "b"), (3, 4)])
+['12', 'ab', '34']
 """
 
-from collections import deque, Iterable
-from propagator.logging import debug
+from collections import deque
+from collections.abc import Iterable
+from itertools import product, starmap
 
 generic_operators = {}
 
+"""
+Returns the tuple of the types of `args`.
+
+Unary and binary operators, the most common ones, get theirs without
+creating an iterator.
+"""
+def _types(args):
+    n = len(args)
+    if n == 2:
+        return (type(args[0]), type(args[1]))
+    elif n == 1:
+        return (type(args[0]),)
+    else:
+        return tuple(map(type, args))
+
+"""
+Tells whether `test`, a test for `assign_operation`, is a class or a
+tuple of classes.
+"""
+def _is_classes(test):
+    if isinstance(test, tuple):
+        return all(isinstance(cls, type) for cls in test)
+    else:
+        return isinstance(test, type)
+
+"""
+Returns a test that checks whether its argument is an instance of
+`classes`.
+"""
+def _instance_test(classes):
+    return type_predicate(lambda thing: isinstance(thing, classes))
+
+"""
+Marks `predicate`, a test for `assign_operation`, as depending only on
+the type of its argument, so that dispatch caches run it once for each
+type. Returns `predicate`.
+"""
+def type_predicate(predicate):
+    predicate.type_based = True
+    return predicate
+
+"""
+Marks `predicate`, a test for `assign_operation`, as depending on the
+values of its argument, so that dispatch caches run it on each call.
+Tests not marked with `type_predicate` already are. Returns `predicate`.
+"""
+def value_predicate(predicate):
+    predicate.type_based = False
+    return predicate
+
+
 """
 Calls one of assigned operators according to the types of its arguments.
+
+As a test for other generic operators, it is not type-based.
 """
 class _GenericOperator:
+    type_based = False
+
     """
     Initialize a `_GenericOperator` with a default operation and no
     assigned functions.
@@ -37,33 +136,162 @@ class _GenericOperator:
     - arity: the number of arguments of the operator
     - default_function: the function that will be called if there are no
       assigned operators.
+    - vectorized: a vectorized implementation of `default_function`, as
+      in `assign`.
     """
-    def __init__(self, name, arity, default_function):
+    def __init__(self, name, arity, default_function, vectorized=None):
         self.name = name
         self.arity = arity
         self.default_function = default_function
         self.assigned_operations = deque()
+        self._vectorized = {}
+        if vectorized is not None:
+            self._vectorized[default_function] = vectorized
+        self._classes = {}
+        self._functions = {}
+        self._candidates = {}
 
-    def operator_for(self, *args):
-        def matches(things, tests):
-            return all(test(thing) for thing, test in zip(things, tests))
+    """
+    Returns the operation assigned to the most specific classes of
+    `types`, or None if no classes of theirs have one.
+    """
+    def _class_function(self, types):
+        if self._classes:
+            for classes in product(*(t.__mro__ for t in types)):
+                function = self._classes.get(classes)
+                if function is not None:
+                    return function
+        return None
 
-        assert len(args) == self.arity, \
-            "Expected arity {0}, received {1}\nArgs: {2}".format(self.arity, len(args), args)
+    """
+    Returns the operations that may match arguments like `args`, for
+    their types, as a list of `(function, guards)` pairs in order.
+    `guards` are the `(index, test)` pairs of the tests that depend on
+    values; the last pair has no guards.
+    """
+    def _candidates_for(self, args):
+        candidates = []
 
         for op in self.assigned_operations:
-            if matches(args, op["tests"]):
-                return op["function"]
+            guards = []
+
+            for index, (thing, test) in enumerate(zip(args, op["tests"])):
+                if not getattr(test, "type_based", False):
+                    guards.append((index, test))
+                elif not test(thing):
+                    break
+            else:
+                candidates.append((op["function"], tuple(guards)))
+                if not guards:
+                    return candidates
 
-        return self.default_function
+        candidates.append((self.default_function, ()))
+        return candidates
+
+    def operator_for(self, *args):
+        assert len(args) == self.arity, \
+            "Expected arity {0}, received {1}\nArgs: {2}".format(self.arity, len(args), args)
+
+        types = _types(args)
+        function = self._functions.get(types)
+        if function is not None:
+            return function
+
+        candidates = self._candidates.get(types)
+        if candidates is None:
+            function = self._class_function(types)
+            if function is not None:
+                self._functions[types] = function
+                return function
+
+            candidates = self._candidates_for(args)
+            if len(candidates) == 1:
+                function = self._functions[types] = candidates[0][0]
+                return function
+            self._candidates[types] = candidates
+
+        for function, guards in candidates:
+            for index, test in guards:
+                if not test(args[index]):
+                    break
+            else:
+                return function
 
     """
-    Calls the first of the assigned operators (in decrescent order of
-    assignment time) whose tests match `args`.
+    Calls the operation assigned to the classes of `args`, or else the
+    first of the assigned operators (in order of assignment time) whose
+    tests match `args`.
     """
     def __call__(self, *args):
-        op = self.operator_for(*args)
-        return op(*args)
+        function = self._functions.get(_types(args))
+        if function is None:
+            function = self.operator_for(*args)
+        return function(*args)
+
+    """
+    Applies the operator to each tuple of arguments in `args_list`, and
+    returns the list of results, in order.
+
+    Tuples are grouped by the types of their elements, and the operation
+    of each group is chosen once. A group whose operation has a
+    vectorized implementation is handed to it whole; groups with tests
+    that depend on values choose the operation of each tuple.
+
+    Raises `TypeError` if a tuple does not have as many arguments as the
+    operator's arity.
+    """
+    def apply_many(self, args_list):
+        args_list = list(args_list)
+        if not args_list:
+            return []
+
+        if set(map(len, args_list)) != {self.arity}:
+            args = next(args for args in args_list if len(args) != self.arity)
+            raise TypeError("Operator '{0}' expected arity {1}, received {2}\nArgs: {3}".format(
+                self.name, self.arity, len(args), args))
+
+        columns = list(zip(*args_list))
+        keys = list(zip(*[map(type, column) for column in columns]))
+
+        if len(set(keys)) == 1:
+            return list(self._apply_group(args_list, columns))
+
+        groups = {}
+        for index, types in enumerate(keys):
+            indices = groups.get(types)
+            if indices is None:
+                indices = groups[types] = []
+            indices.append(index)
+
+        results = [None] * len(args_list)
+
+        for indices in groups.values():
+            group = [args_list[index] for index in indices]
+            for index, output in zip(indices, self._apply_group(group)):
+                results[index] = output
+
+        return results
+
+    """
+    Applies the operator to each tuple of arguments in `group`, whose
+    elements all have the same types, and returns an iterable of the
+    results. `columns`, if given, are the arguments of `group` by
+    position.
+    """
+    def _apply_group(self, group, columns=None):
+        function = self.operator_for(*group[0])
+
+        if self._functions.get(_types(group[0])) is not function:
+            return [self.operator_for(*args)(*args) for args in group]
+
+        vectorized = self._vectorized.get(function)
+        if vectorized is None:
+            return starmap(function, group)
+        if columns is None:
+            columns = zip(*group)
+        return vectorized(*map(list, columns))
+
+    map = apply_many
 
     def __str__(self):
         return "_GenericOperator('{name}', {arity}, {default_function})".format(**vars(self))
@@ -81,13 +309,47 @@ class _GenericOperator:
 
     - function: the function that will perform the operation in this case
     - tests: an iterable containing functions to test the generic operator
-      arguments.
+      arguments, or classes (or tuples of classes) they must be instances
+      of.
+    - vectorized: optionally, a function that performs the operation on
+      many arguments at once, for `apply_many`. It is called with one
+      list for each argument of the operator, and returns a sequence of
+      results.
     """
-    def assign(self, function, tests):
-        self.assigned_operations.append({
-            "function": function,
-            "tests": tests
-        })
+    def assign(self, function, tests, vectorized=None):
+        if vectorized is not None:
+            self._vectorized[function] = vectorized
+        if all(_is_classes(test) for test in tests):
+            options = [test if isinstance(test, tuple) else (test,) for test in tests]
+            for classes in product(*options):
+                self._classes[classes] = function
+        else:
+            self.assigned_operations.append({
+                "function": function,
+                "tests": [_instance_test(test) if _is_classes(test) else test for test in tests]
+            })
+        self._functions.clear()
+        self._candidates.clear()
+
+"""
+A unary `_GenericOperator`, whose calls do not pack their argument.
+"""
+class _UnaryOperator(_GenericOperator):
+    def __call__(self, x):
+        function = self._functions.get((type(x),))
+        if function is None:
+            function = self.operator_for(x)
+        return function(x)
+
+"""
+A binary `_GenericOperator`, whose calls do not pack their arguments.
+"""
+class _BinaryOperator(_GenericOperator):
+    def __call__(self, x, y):
+        function = self._functions.get((type(x), type(y)))
+        if function is None:
+            function = self.operator_for(x, y)
+        return function(x, y)
 
 """
 Makes and jeturns a generic operator with a given name.
@@ -97,11 +359,14 @@ Parameters:
 - arity: the number of arguments of the operator
 - default_function: the function that will be called if there are no
   assigned operators.
+- vectorized: optionally, a vectorized implementation of
+  `default_function`, for `apply_many`.
 
 Returns a `_GenericOperator` object to be used as a callable operator.
 """
-def make_generic_operator(arity, name, default_function):
-    generic_operators[name] = _GenericOperator(name, arity, default_function)
+def make_generic_operator(arity, name, default_function, vectorized=None):
+    cls = {1: _UnaryOperator, 2: _BinaryOperator}.get(arity, _GenericOperator)
+    generic_operators[name] = cls(name, arity, default_function, vectorized)
     return generic_operators[name]
 
 
@@ -125,14 +390,24 @@ You can do:
 
 >>> assign_operation("mul", my_function, ([is_foo, is_bar], [is_bar, is_foo]))
 
+Tests can also be classes, or tuples of classes, that the arguments must
+be instances of:
+
+>>> assign_operation("mul", my_function, [Foo, (Bar, Baz)])
+
+A sequence of several tests must then be given as lists, since a tuple
+of classes is a single test.
+
 Parameters:
 
 - name: the name of the generic operator
 - function: the function that will perform the operation in this case
 - tests: an iterable containing functions to test the generic operator
-  arguments.
+  arguments, or classes (or tuples of classes) they must be instances of.
+- vectorized: optionally, a vectorized implementation of `function`, as
+  in `_GenericOperator.assign`.
 """
-def assign_operation(name, function, tests):
+def assign_operation(name, function, tests, vectorized=None):
     def is_iter(thing):
         return isinstance(thing, Iterable)
 
@@ -142,10 +417,13 @@ def assign_operation(name, function, tests):
 
     assert is_iter(tests) and len(tests) > 0
 
-    my_tests_iter = is_iter(tests[0]) and tests or [tests]
+    if is_iter(tests[0]) and not _is_classes(tests[0]):
+        my_tests_iter = tests
+    else:
+        my_tests_iter = [tests]
 
     for tests in my_tests_iter:
         assert len(tests) == gen_op.arity, \
             "Operator '{0}' expected arity {1}, received {1}".format(name, gen_op.arity, len(tests))
 
-        gen_op.assign(function, tests)
+        gen_op.assign(function, tests, vectorized)
@@ -1,7 +1,30 @@
+"""
+The "propagator" logger.
+
+Importing this module configures nothing: like any library logger, it
+only has a `logging.NullHandler`, and its messages go wherever the
+application's logging configuration sends them. `configure` applies the
+configuration in `propagator.config`, which logs to the console and to
+`propagator.log`.
+
+Schedulers do not log by themselves; attach a
+`propagator.tracing.LoggingTracer` to trace them through this logger.
+"""
+
 import logging, logging.config
-from propagator.config import LOGGING
-logging.config.dictConfig(LOGGING)
 
 logger = logging.getLogger("propagator")
+logger.addHandler(logging.NullHandler())
+
+debug, info, warn, error = logger.debug, logger.info, logger.warning, logger.error
+
+"""
+Configures logging with `config`, a `logging.config.dictConfig`
+dictionary that defaults to `propagator.config.LOGGING`.
+"""
+def configure(config=None):
+    if config is None:
+        from propagator.config import LOGGING
+        config = LOGGING
 
-debug, info, warn, error = logger.debug, logger.info, logger.warn, logger.error
+    logging.config.dictConfig(config)
@@ -2,7 +2,6 @@ from functools import partial
 from operator import is_
 
 from propagator.generic_operator import make_generic_operator, assign_operation
-from propagator.logging import debug
 
 class Contradiction:
     def __init__(self, message=None):
@@ -26,33 +25,57 @@ is_not_nothing = make_generic_operator(1, "is_not_nothing", lambda x: not is_not
 is_anything = lambda x: True
 
 def _default_merge(content, increment):
-    debug("Merging {content} and {increment}...".format(**vars()))
     if content == increment:
         return content
     else:
         return Contradiction('{content} != {increment}'.format(**vars()))
 
+"""
+Merges `increment` into `content`, and returns the result.
+
+Merge operations report that `increment` adds no information to
+`content` by returning `content` itself; any other result means the
+information increased. This lets callers, like cells, tell whether a
+merge changed anything without comparing the results.
+"""
 merge = make_generic_operator(2, "merge", _default_merge)
 
+"""
+Merges `increment` into `content`, and returns the merged content and
+whether it has more information than `content`.
+
+Merging `content` itself or nothing into `content` does not change it,
+so `merge` is not called for them.
+"""
+def merge_changed(content, increment):
+    if increment is content or increment is None:
+        return content, False
+
+    answer = merge(content, increment)
+    return answer, answer is not content
+
+"""
+Tells whether `v1` has all the information of `v2`.
+"""
 def implies(v1, v2):
-    return v1 == merge(v1, v2)
+    return v2 is v1 or merge(v1, v2) is v1
 
 
 assign_operation("merge",
     lambda content, increment: content,
-    [is_not_nothing, is_nothing]
+    [object, type(None)]
 )
 
 assign_operation("merge",
     lambda content, increment: increment,
-    [is_nothing, is_not_nothing]
+    [type(None), object]
 )
 
 assign_operation("merge",
     lambda contradiction, _: contradiction,
-    [is_contradictory, is_anything]
+    [Contradiction, object]
 )
 assign_operation("merge",
     lambda _, contradiction: contradiction,
-    [is_anything, is_contradictory]
+    [object, Contradiction]
 )
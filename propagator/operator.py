@@ -27,3 +27,5 @@ sqrt = make_generic_operator(1, "sqrt", math.sqrt)
 abs = make_generic_operator(1, "abs", abs)
 
 square = make_generic_operator(1, "square", lambda x: mul(x, x))
+
+choose = make_generic_operator(3, "choose", lambda predicate, if_true, if_false: if_true if predicate else if_false)
@@ -0,0 +1,127 @@
+# -*- encoding: utf-8 -*-
+"""
+A scheduler that runs the propagators of each wave on a thread pool.
+
+How to use this module
+----------------------
+
+>>> from propagator import Network
+>>> from propagator.parallel import ParallelScheduler
+>>> network = Network(scheduler=ParallelScheduler(max_workers=8))
+
+Propagators only gain from running in parallel when their bodies
+release the GIL, like NumPy-heavy or I/O-bound ones, or on free-threaded
+builds of CPython.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from propagator.core import Scheduler, _activate, _deactivate, _refuse_awaitable
+
+"""
+Splits `wave` into batches of propagators that do not write to the same
+cells, according to their declared `outputs`.
+
+Propagators are kept in order, and each one goes into the first batch
+that does not conflict with it.
+"""
+def independent_batches(wave):
+    pending = wave
+
+    while pending:
+        claimed = set()
+        batch = []
+        deferred = []
+
+        for propagator in pending:
+            outputs = getattr(propagator, "outputs", ())
+            if claimed.isdisjoint(outputs):
+                claimed.update(outputs)
+                batch.append(propagator)
+            else:
+                deferred.append(propagator)
+
+        yield batch
+        pending = deferred
+
+
+"""
+A `Scheduler` that fires non-conflicting propagators of the same wave
+concurrently, on a `concurrent.futures.ThreadPoolExecutor`.
+
+Each wave is split by `independent_batches`, and each batch is run on
+the pool; the wave ends when all its batches are done. Propagators
+whose outputs are not declared may still write to the same cells, so
+merges into a cell are serialized by a lock chosen from `cell_locks`.
+Since merging only adds information, the network reaches the same
+fixpoint as with the serial `Scheduler`. `current_propagator` is kept
+per thread, and the queue is only changed while holding a lock, even
+when a propagator calls `abort_process`.
+
+Parameters:
+
+- `policy`: the scheduling policy; defaults to a `FIFOPolicy`.
+- `max_workers`: the size of the thread pool.
+- `lock_stripes`: how many locks are shared among the cells.
+"""
+class ParallelScheduler(Scheduler):
+    def __init__(self, policy=None, max_workers=None, lock_stripes=64):
+        self._local = threading.local()
+        super().__init__(policy)
+        self.max_workers = max_workers
+        self.cell_locks = [threading.Lock() for _ in range(lock_stripes)]
+        self._alert_lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def current_propagator(self):
+        return getattr(self._local, "propagator", None)
+
+    @current_propagator.setter
+    def current_propagator(self, propagator):
+        self._local.propagator = propagator
+
+    def alert_neighbors(self, neighbors):
+        with self._alert_lock:
+            super().alert_neighbors(neighbors)
+
+    def abort_process(self, value):
+        with self._alert_lock:
+            super().abort_process(value)
+
+    def run_wave(self, wave):
+        for batch in independent_batches(wave):
+            if len(batch) == 1:
+                super().run_wave(batch)
+                continue
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+
+            self.firings += len(batch)
+            futures = [self._executor.submit(self._fire, p) for p in batch]
+            wait(futures)
+            for future in futures:
+                future.result()
+
+    def _fire(self, propagator):
+        if self.tracer is not None:
+            self.tracer.fired(propagator)
+        _activate(self)
+        self.current_propagator = propagator
+        try:
+            result = propagator() if self.profiler is None else self.profiler.fire(propagator)
+            if result is not None:
+                _refuse_awaitable(propagator, result)
+        finally:
+            self.current_propagator = None
+            _deactivate()
+
+    """
+    Shuts down the thread pool; it is started again if needed.
+    """
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -7,41 +7,42 @@ that calculates this relationship when the cells have enough content.
 """
 
 from propagator import Propagator, Cell
-from propagator.logging import debug
 from propagator.operator import add, sub, mul, truediv, lt, gt, le, ge, not_, \
-        sqrt, abs, square
+        sqrt, abs, square, choose
 
 """
-Takes a function `f` and returns a function wrapper that applies `f`
-to its arguments if all of them are not `None`; returns `None` otherwise.
+A propagator that applies its `to_do` function to the contents of its
+input cells, and adds the result to its output cell.
+
+`to_do` is "lifted": if any input cell has no content, `None` is added
+instead of calling it.
+
+Keeping the function in the propagator, instead of in closures around
+it, keeps primitive propagators small.
 """
-def _lift_to_cell_contents(f):
-    def lift_helper(*args):
-        if None in args:
-            return None
-        return f(*args)
-    return lift_helper
+class Primitive(Propagator):
+    __slots__ = ()
+
+    def __call__(self):
+        args = [c.content for c in self.neighbors]
+        self.outputs[0].add_content(None if None in args else self.to_do(*args))
 
 """
-Returns a factory of propagators that apply a lifted version of function
-`f` to its input cells and store the result on its output cell.
+Returns a factory of `Primitive` propagators that apply function `f` to
+its input cells and store the result on its output cell.
 
 The input cells are defined as the factory's all but last arguments, and
 the output cell as the last one.
 
-It "lifts" `f` by wrapping it with `_lift_to_cell_contents`, so that it
-will return `None` if any of its arguments is `None`.
+The propagators are named `name`, which defaults to the name of `f`
+(such as the name of a generic operator).
 """
-def make_primitive(f):
+def make_primitive(f, name=None):
+    if name is None:
+        name = getattr(f, "name", None) or getattr(f, "__name__", "primitive")
 
     def make_primitive_helper(*cells):
-        inputs, output = cells[:-1], cells[-1]
-        lifted_f = _lift_to_cell_contents(f)
-
-        def to_do():
-            output.add_content(lifted_f(*[c.content for c in inputs]))
-
-        return Propagator(inputs, to_do)
+        return Primitive(cells[:-1], f, cells[-1:], name)
 
     return make_primitive_helper
 
@@ -120,21 +121,21 @@ Returns a factory of propagators that always stores `value` on its
 output.
 """
 def constant(value):
-    return make_primitive(lambda: value)
+    return make_primitive(lambda: value, "constant")
 
 """
 A factory of propagators that make its output `if_true` if `predicate`
 is true, and `if_false` otherwise.
+
+The choice is made by the generic operator `choose`, so that contents
+like `TMS`es can take part in it.
 """
 def conditional(p, if_true, if_false, output):
     def conditional_helper():
         if p.content is not None:
-            if p.content:
-                output.add_content(if_true.content)
-            else:
-                output.add_content(if_false.content)
+            output.add_content(choose(p.content, if_true.content, if_false.content))
 
-    return Propagator([p, if_true, if_false], conditional_helper)
+    return Propagator([p, if_true, if_false], conditional_helper, [output], "conditional")
 
 """
 A factory of propagators that make its output `if_true` if `predicate`
@@ -0,0 +1,150 @@
+# -*- encoding: utf-8 -*-
+"""
+Per-propagator profiling of a scheduler.
+
+A `Profiler` attached to a `Scheduler` records, for each propagator it
+fires:
+
+- how many times it was fired;
+- the cumulative and maximum wall time of its firings;
+- how many times it added content to a cell, and how many of those
+  additions changed the cell.
+
+How to use this module
+----------------------
+
+>>> from propagator import scheduler
+>>> from propagator.profiling import Profiler
+>>> profiler = Profiler()
+>>> scheduler.profiler = profiler
+>>> scheduler.run()
+>>> profiler.report()
+>>> profiler.dump(open("profile.json", "w"))
+
+Only firings count towards a propagator: content added from outside a
+firing is not recorded. For `async def` propagators, only the time to
+start them is measured, but all the content they add is counted.
+"""
+
+import json
+import sys
+import threading
+from time import perf_counter
+
+"""
+Returns a readable label for `propagator`: its name followed by its
+input and output cells, when they are known.
+"""
+def label(propagator):
+    name = getattr(propagator, "name", None) or getattr(propagator, "__name__", repr(propagator))
+    inputs = getattr(propagator, "neighbors", ())
+    outputs = getattr(propagator, "outputs", ())
+
+    if not inputs and not outputs:
+        return name
+
+    def names(cells):
+        return ", ".join(str(cell.name) for cell in cells)
+
+    cells = names(inputs)
+    if outputs:
+        cells = (cells + " -> " if cells else "-> ") + names(outputs)
+
+    return "{0}({1})".format(name, cells)
+
+
+"""
+The statistics recorded for one propagator.
+"""
+class PropagatorStats:
+    def __init__(self, propagator):
+        self.label = label(propagator)
+        self.firings = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.additions = 0
+        self.changes = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+"""
+Records statistics about the propagators fired by the scheduler it is
+attached to, through the scheduler's `profiler` attribute.
+
+Statistics are updated while holding a lock, so a profiler can measure
+a `propagator.parallel.ParallelScheduler`, whose propagators are fired
+on several threads.
+"""
+class Profiler:
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    """
+    Fires `propagator`, measuring it.
+    """
+    def fire(self, propagator):
+        stats = self.stats.get(propagator)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.get(propagator)
+                if stats is None:
+                    stats = self.stats[propagator] = PropagatorStats(propagator)
+
+        start = perf_counter()
+
+        try:
+            return propagator()
+        finally:
+            elapsed = perf_counter() - start
+            with self._lock:
+                stats.firings += 1
+                stats.total_time += elapsed
+                if elapsed > stats.max_time:
+                    stats.max_time = elapsed
+
+    """
+    Records that `propagator`, the scheduler's `current_propagator`,
+    added content to a cell, and whether it changed the cell.
+    """
+    def added_content(self, propagator, changed):
+        stats = None if propagator is None else self.stats.get(propagator)
+        if stats is not None:
+            with self._lock:
+                stats.additions += 1
+                if changed:
+                    stats.changes += 1
+
+    def clear(self):
+        with self._lock:
+            self.stats.clear()
+
+    """
+    Returns the statistics as a list of dictionaries, sorted by
+    descending cumulative time.
+    """
+    def as_dicts(self):
+        ordered = sorted(self.stats.values(), key=lambda s: s.total_time, reverse=True)
+        return [stats.as_dict() for stats in ordered]
+
+    """
+    Writes the statistics to the file `fp` as JSON.
+    """
+    def dump(self, fp):
+        json.dump(self.as_dicts(), fp, indent=2)
+
+    """
+    Prints a table of the `limit` propagators that took the most time.
+    """
+    def report(self, limit=None, file=None):
+        file = sys.stdout if file is None else file
+        rows = self.as_dicts()[:limit]
+
+        print("{0:>8} {1:>12} {2:>12} {3:>9} {4:>9}  {5}".format(
+            "firings", "total (ms)", "max (ms)", "adds", "changes", "propagator"), file=file)
+
+        for row in rows:
+            print("{firings:8} {total:12.3f} {max:12.3f} {additions:9} {changes:9}  {label}".format(
+                total=row["total_time"] * 1000, max=row["max_time"] * 1000, **row), file=file)
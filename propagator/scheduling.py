@@ -0,0 +1,245 @@
+# -*- encoding: utf-8 -*-
+"""
+Scheduling policies for the propagator network.
+
+A policy is the queue in which a `Scheduler` keeps its alerted
+propagators, and decides in which order they are fired. Every policy
+supports:
+
+- `add(propagator)`: alert a propagator, ignoring it if it is already
+  queued;
+- `next_wave()`: remove and return the list of propagators that should
+  be fired next;
+- `requeue(propagators)`: put back propagators taken by `next_wave`
+  that were not fired, so that they are fired next;
+- `clear()`, `len()` and iteration over the queued propagators;
+- `reset()`: empty the queue and forget anything learned about the
+  network, when the scheduler is initialized.
+
+Policies defined in this module:
+
+- `FIFOPolicy`: fires propagators in the order they were alerted.
+- `PriorityPolicy`: fires propagators by ascending priority.
+- `RankPolicy`: fires propagators by their topological rank in the
+  network.
+- `CostPolicy`: fires propagators by ascending user-defined cost.
+
+How to use this module
+----------------------
+
+>>> from propagator import scheduler
+>>> from propagator.scheduling import RankPolicy
+>>> scheduler.initialize(RankPolicy())
+"""
+
+import heapq
+from itertools import count
+from weakref import WeakKeyDictionary
+
+from propagator.util import AlertQueue, WeakOrderedSet
+
+"""
+Fires propagators in the order they were alerted.
+
+Each wave holds every propagator alerted when it starts; this is the
+default policy of a `Scheduler`. The queue is an `AlertQueue`, so
+alerting a propagator that is already queued costs no allocation, and
+each wave is handed over without copying the queue.
+"""
+class FIFOPolicy(AlertQueue):
+    def next_wave(self):
+        return self.take()
+
+    """
+    Puts `propagators` back at the front of the queue, in order.
+
+    Propagators that were alerted again in the meantime keep their
+    place.
+    """
+    def requeue(self, propagators):
+        queued = self._items
+        self._items = []
+        for p in propagators:
+            self.add(p)
+        self._items.extend(queued)
+
+    def reset(self):
+        self.clear()
+
+
+"""
+Fires propagators by ascending priority.
+
+Each wave holds all the queued propagators that share the lowest
+priority. Propagators with the same priority are fired in the order they
+were alerted.
+
+Parameters:
+
+- `priority`: a function that takes a propagator and returns its
+  priority. It is called once each time a propagator is queued.
+"""
+class PriorityPolicy:
+    def __init__(self, priority):
+        self.priority = priority
+        self._heap = []
+        self._queued = set()
+        self._counter = count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        for entry in sorted(self._heap):
+            yield entry[2]
+
+    def add(self, propagator):
+        if propagator not in self._queued:
+            self._queued.add(propagator)
+            heapq.heappush(self._heap, (self.priority(propagator), next(self._counter), propagator))
+
+    def next_wave(self):
+        heap = self._heap
+
+        if not heap:
+            return []
+
+        priority, _, propagator = heapq.heappop(heap)
+        wave = [propagator]
+
+        while heap and heap[0][0] == priority:
+            wave.append(heapq.heappop(heap)[2])
+
+        self._queued.difference_update(wave)
+        return wave
+
+    def requeue(self, propagators):
+        for p in propagators:
+            self.add(p)
+
+    """
+    Recomputes the priorities of all queued propagators.
+    """
+    def reprioritize(self):
+        heap = [(self.priority(p), n, p) for _, n, p in self._heap]
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def clear(self):
+        self._heap.clear()
+        self._queued.clear()
+
+    def reset(self):
+        self.clear()
+
+
+"""
+Fires propagators by ascending user-defined cost.
+
+Parameters:
+
+- `cost`: a function that takes a propagator and returns a number;
+  cheaper propagators are fired first.
+"""
+class CostPolicy(PriorityPolicy):
+    def __init__(self, cost):
+        super().__init__(cost)
+
+
+"""
+Fires propagators by their topological rank in the network.
+
+The rank of a propagator is 0 if none of its input cells is written by
+a known propagator, and one more than the highest rank among the
+propagators writing its input cells otherwise. Firing low ranks first
+lets a cell settle before the propagators reading it run, instead of
+refining their outputs once per input.
+
+The graph is learned from the `Propagator` objects that get alerted:
+their `neighbors` are their inputs and their `outputs` are the cells
+they write. Propagators without declared outputs, like compound ones,
+are not considered writers. Edges that close a cycle are ignored, so
+ranks inside a cycle only approximate an order.
+
+The policy must be installed before the network is built, so that it
+sees every propagator when they are first alerted. Ranks are computed
+lazily: when new propagators are seen, the queue is reprioritized once,
+before the next wave is fired. The graph only references propagators
+and cells weakly, so it does not keep unreachable subnetworks alive.
+"""
+class RankPolicy(PriorityPolicy):
+    def __init__(self):
+        super().__init__(self._priority)
+        self._known = WeakOrderedSet()
+        self._writers = WeakKeyDictionary()
+        self._ranks = WeakKeyDictionary()
+        self._stale = False
+
+    def _priority(self, propagator):
+        return 0 if self._stale else self.rank(propagator)
+
+    def add(self, propagator):
+        if propagator not in self._known:
+            self._known.add(propagator)
+            for cell in getattr(propagator, "outputs", ()):
+                writers = self._writers.get(cell)
+                if writers is None:
+                    writers = self._writers[cell] = WeakOrderedSet()
+                writers.add(propagator)
+            self._stale = True
+
+        super().add(propagator)
+
+    def next_wave(self):
+        if self._stale:
+            self._ranks.clear()
+            self._stale = False
+            self.reprioritize()
+
+        return super().next_wave()
+
+    def _predecessors(self, propagator):
+        writers = self._writers
+        for cell in getattr(propagator, "neighbors", ()):
+            yield from writers.get(cell, ())
+
+    """
+    Returns the topological rank of `propagator`.
+    """
+    def rank(self, propagator):
+        ranks = self._ranks
+
+        if propagator in ranks:
+            return ranks[propagator]
+
+        ranks[propagator] = 0
+        stack = [(propagator, self._predecessors(propagator))]
+        visiting = {propagator}
+
+        while stack:
+            node, predecessors = stack[-1]
+
+            for predecessor in predecessors:
+                if predecessor in visiting:
+                    continue
+                if predecessor not in ranks:
+                    ranks[predecessor] = 0
+                    visiting.add(predecessor)
+                    stack.append((predecessor, self._predecessors(predecessor)))
+                    break
+                ranks[node] = max(ranks[node], ranks[predecessor] + 1)
+            else:
+                stack.pop()
+                visiting.discard(node)
+                if stack:
+                    parent = stack[-1][0]
+                    ranks[parent] = max(ranks[parent], ranks[node] + 1)
+
+        return ranks[propagator]
+
+    def reset(self):
+        super().reset()
+        self._known.clear()
+        self._writers.clear()
+        self._ranks.clear()
+        self._stale = False
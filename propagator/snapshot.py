@@ -0,0 +1,208 @@
+# -*- encoding: utf-8 -*-
+"""
+Snapshots of the state of a propagator network.
+
+A snapshot holds the content of every cell of a scheduler and the
+propagators that are still alerted, so that a network can be restored
+after a restart without propagating all of its inputs again.
+
+How to use this module
+----------------------
+
+>>> from propagator import snapshot
+>>> snapshot.save("network.snap", network.scheduler)
+
+and later, after building the same network again:
+
+>>> snapshot.restore("network.snap", network.scheduler)
+>>> network.run()
+
+The network is found by walking it from the scheduler's propagators,
+and from the cells given to `save` and `restore`. Cells and propagators
+are matched by their `id`s, so the network must be built in the same
+order as the one that was saved. Contents are pickled,
+so they can be `Interval`s, `Supported` values, `Contradiction`s or any
+other picklable object.
+
+Restoring does not fire any propagator: the subnetworks of the compound
+propagators that were built are built again, in the same order, and
+then only the propagators that were alerted in the snapshot and the
+neighbors of the cells whose content differs from the snapshot's are
+alerted. For the ids of the subnetworks to match, no cell or propagator
+should be created outside of compound propagators once the saved
+network starts running.
+"""
+
+import os
+import pickle
+import warnings
+from collections import namedtuple
+
+from propagator.core import current_scheduler
+from propagator.merging import merge_changed
+
+MAGIC = b"PROPSNP1"
+
+"""
+The state of a network, as read by `load`:
+
+- `contents`: a dictionary from cell ids to contents, for the cells
+  that have content.
+- `alerted`: the ids of the alerted propagators, in queue order.
+- `built`: the ids of the compound propagators that were built, in the
+  order they were built.
+- `cells`: the ids of all the cells that were saved, with or without
+  content; None in snapshots that do not record them.
+"""
+Snapshot = namedtuple("Snapshot", ["contents", "alerted", "built", "cells"])
+Snapshot.__new__.__defaults__ = (None,)
+
+def _propagators(scheduler):
+    return [p for p in scheduler.propagators_ever_alerted if hasattr(p, "id")]
+
+"""
+Returns the cells and the propagators of `scheduler`'s network, found by
+walking it from its live propagators and from `cells`: the cells a
+propagator reads or writes, and the propagators that read a cell, are
+part of the network.
+
+Cells that no live propagator reads or declares as an output, such as
+a cell only written by a propagator whose function closes over it, are
+only found if they are in `cells`.
+"""
+def _network(scheduler, cells=None):
+    found_cells = {}
+    found_propagators = {}
+    to_visit = _propagators(scheduler)
+
+    for cell in cells or ():
+        found_cells.setdefault(cell.id, cell)
+        to_visit.extend(cell.neighbors)
+
+    while to_visit:
+        propagator = to_visit.pop()
+        if propagator in found_propagators or not hasattr(propagator, "id"):
+            continue
+        found_propagators[propagator] = None
+
+        for cell in propagator.neighbors + propagator.outputs:
+            if cell.id not in found_cells:
+                found_cells[cell.id] = cell
+                to_visit.extend(cell.neighbors)
+
+    return list(found_cells.values()), list(found_propagators)
+
+def _open(file, mode):
+    if isinstance(file, (str, bytes, os.PathLike)):
+        return open(file, mode)
+    return None
+
+"""
+Writes a snapshot of `scheduler` to `file`.
+
+Parameters:
+
+- `file`: a path, or a binary file open for writing.
+- `scheduler`: the scheduler to save; defaults to the current one.
+- `cells`: cells to save, besides the ones found from the scheduler's
+  propagators; the network is also walked from them. Cells that no live
+  propagator reads or writes are only saved if they are passed here.
+"""
+def save(file, scheduler=None, cells=None):
+    scheduler = current_scheduler() if scheduler is None else scheduler
+    network_cells, propagators = _network(scheduler, cells)
+
+    contents = {cell.id: cell.content for cell in network_cells
+            if cell.content is not None}
+    alerted = [p.id for p in scheduler.alerted_propagators if hasattr(p, "id")]
+    compounds = [p for p in propagators if getattr(p, "built", False)]
+    built = [p.id for p in sorted(compounds, key=lambda p: p.built)]
+
+    saved = [cell.id for cell in network_cells]
+
+    data = MAGIC + pickle.dumps(Snapshot(contents, alerted, built, saved), pickle.HIGHEST_PROTOCOL)
+
+    f = _open(file, "wb")
+    if f is None:
+        file.write(data)
+    else:
+        with f:
+            f.write(data)
+
+"""
+Reads a snapshot from `file`, which is a path or a binary file open for
+reading, and returns it as a `Snapshot`.
+"""
+def load(file):
+    f = _open(file, "rb")
+    if f is None:
+        data = file.read()
+    else:
+        with f:
+            data = f.read()
+
+    assert data[:len(MAGIC)] == MAGIC, "Not a propagator snapshot"
+    return Snapshot(*pickle.loads(data[len(MAGIC):]))
+
+"""
+Restores a snapshot into `scheduler`'s network, which must already be
+built.
+
+The compound propagators that were built in the snapshot are built,
+then the content of each cell is replaced by the snapshot's, merged
+with the content the cell already has. The scheduler's queue is replaced
+by the propagators that were alerted in the snapshot and the neighbors
+of the cells whose content is not the snapshot's; the other propagators
+are not run again.
+
+Parameters:
+
+- `file`: a path, or a binary file open for reading.
+- `scheduler`: the scheduler to restore into; defaults to the current
+  one.
+- `cells`: cells to restore, besides the ones found from the
+  scheduler's propagators, as in `save`.
+
+A `RuntimeWarning` is issued if cells are found in the network that
+were not saved, or if saved contents belong to cells that are not found
+in the network: they were not reachable from the propagators when one of
+the networks was walked, and should be passed as `cells`.
+
+Returns the `Snapshot` that was restored.
+"""
+def restore(file, scheduler=None, cells=None):
+    snapshot = load(file)
+    scheduler = current_scheduler() if scheduler is None else scheduler
+    propagators = {p.id: p for p in _network(scheduler, cells)[1]}
+
+    for i in snapshot.built:
+        if i not in propagators:
+            # Built by a compound propagator built before it
+            propagators = {p.id: p for p in _network(scheduler, cells)[1]}
+
+        compound = propagators.get(i)
+        if compound is not None and not compound.built:
+            compound.build()
+
+    network_cells, network_propagators = _network(scheduler, cells)
+    propagators = {p.id: p for p in network_propagators}
+    alerts = [propagators[i] for i in snapshot.alerted if i in propagators]
+
+    for cell in network_cells:
+        saved = snapshot.contents.get(cell.id)
+        content, changed = merge_changed(saved, cell.content)
+        cell.content = content
+        if changed:
+            alerts.extend(cell.neighbors)
+
+    found = {cell.id for cell in network_cells}
+    missing = len(set(snapshot.contents) - found)
+    unsaved = 0 if snapshot.cells is None else len(found - set(snapshot.cells))
+    if missing or unsaved:
+        warnings.warn("{unsaved} cells were not saved and {missing} saved cells were not found; "
+                "pass them to save() and restore() as `cells`".format(**vars()), RuntimeWarning)
+
+    scheduler.alerted_propagators.clear()
+    scheduler.alert_propagators(alerts)
+
+    return snapshot
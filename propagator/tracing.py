@@ -0,0 +1,98 @@
+# -*- encoding: utf-8 -*-
+"""
+Structured tracing of schedulers.
+
+A tracer attached to a `Scheduler` through its `tracer` attribute is
+called on each event of the scheduler and its cells, with the objects
+involved instead of formatted messages. When no tracer is attached,
+which is the default, tracing costs a single attribute check per event,
+and nothing is formatted.
+
+Events are the methods of `Tracer`, which ignores them all; subclass it
+and override the events of interest. `LoggingTracer` writes every event
+to a `logging.Logger`.
+
+How to use this module
+----------------------
+
+>>> from propagator import scheduler
+>>> from propagator.tracing import LoggingTracer
+>>> import propagator.logging
+>>> propagator.logging.configure()
+>>> scheduler.tracer = LoggingTracer()
+>>> scheduler.run()
+"""
+
+import logging
+
+"""
+A tracer that ignores every event.
+"""
+class Tracer:
+    """
+    The scheduler was initialized.
+    """
+    def initialized(self, scheduler):
+        pass
+
+    """
+    The scheduler started a run.
+    """
+    def run_started(self, scheduler):
+        pass
+
+    """
+    The scheduler finished a run, with `status`.
+    """
+    def run_finished(self, scheduler, status):
+        pass
+
+    """
+    The scheduler is about to fire `propagator`.
+    """
+    def fired(self, propagator):
+        pass
+
+    """
+    `cell` was created.
+    """
+    def new_cell(self, cell):
+        pass
+
+    """
+    `increment` was added to `cell`, which now holds `content`;
+    `changed` tells whether that differs from its previous content.
+    """
+    def content_added(self, cell, increment, content, changed):
+        pass
+
+
+"""
+A tracer that writes events to `logger` (by default, the "propagator"
+logger) at the DEBUG level.
+
+Messages are passed to the logger with their arguments, so they are only
+formatted if the logger handles DEBUG messages.
+"""
+class LoggingTracer(Tracer):
+    def __init__(self, logger=None):
+        self.logger = logging.getLogger("propagator") if logger is None else logger
+
+    def initialized(self, scheduler):
+        self.logger.debug("Initializing scheduler")
+
+    def run_started(self, scheduler):
+        self.logger.debug("Running scheduler")
+
+    def run_finished(self, scheduler, status):
+        self.logger.debug("Scheduler done: %s", status)
+
+    def fired(self, propagator):
+        self.logger.debug("Running %s", propagator)
+
+    def new_cell(self, cell):
+        self.logger.debug("New cell: %s", cell)
+
+    def content_added(self, cell, increment, content, changed):
+        if changed:
+            self.logger.debug("Adding content %s to %s", content, cell)
@@ -1,5 +1,7 @@
-from collections import deque, Iterable
-import greenlet
+from collections import deque
+from collections.abc import Iterable
+from types import BuiltinMethodType, MethodType
+from weakref import KeyedRef, WeakMethod
 
 
 """
@@ -34,12 +36,17 @@ callcc (which should actually be call/cc or call-with-current-continuation)
 is a function which accepts a function which calls a callback and returns
 the thing which that function calls the callback with. Pretty much.
 
+It needs the `greenlet` package, which is only imported when `callcc` is
+called; the scheduler itself does not use it.
+
 Source: http://sigusr2.net/2011/Aug/09/call-cc-for-python.html
 """
 class ContinuationError(Exception):
     pass
 
 def callcc(f):
+    import greenlet
+
     saved = [greenlet.getcurrent()]
 
     def cont(val):
@@ -92,3 +99,157 @@ class SetQueue(set):
     def clear(self):
         super(SetQueue, self).clear()
         self._queue.clear()
+
+
+"""
+A queue of unique elements, with constant-time `add`, that hands its
+elements over without copying them when it is emptied.
+
+The queue keeps its elements as the keys of a dictionary, which is
+replaced by an empty one when the queue is emptied. Propagators and
+functions are hashed by identity; elements that cannot be hashed are
+keyed by their `id`, which is not reused while the queue keeps them
+alive. Elements are never changed, so the same callable can be queued
+in several queues at once.
+"""
+class AlertQueue:
+    def __init__(self):
+        self._items = []
+        self._queued = {}
+        self._unhashable = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, item):
+        try:
+            return item in self._queued
+        except TypeError:
+            return id(item) in self._unhashable
+
+    def __repr__(self):
+        return "{0}({1!r})".format(type(self).__name__, self._items)
+
+    def add(self, item):
+        queued = self._queued
+        try:
+            if item in queued:
+                return
+            queued[item] = None
+        except TypeError:
+            unhashable = self._unhashable
+            if id(item) in unhashable:
+                return
+            unhashable[id(item)] = None
+
+        self._items.append(item)
+
+    """
+    Empties the queue, returning the list of its elements in order.
+    """
+    def take(self):
+        items = self._items
+        self._items = []
+        self._queued = {}
+        if self._unhashable:
+            self._unhashable = {}
+        return items
+
+    def clear(self):
+        self.take()
+
+
+"""
+A weak reference to a bound method that knows its key in a
+`WeakOrderedSet`, like `KeyedRef`.
+"""
+class _KeyedMethodRef(WeakMethod):
+    __slots__ = ("key",)
+
+    def __new__(cls, method, callback, key):
+        self = super().__new__(cls, method, callback)
+        self.key = key
+        return self
+
+    def __init__(self, method, callback, key):
+        super().__init__(method, callback)
+
+_weak_refs = (KeyedRef, _KeyedMethodRef)
+
+"""
+An insertion-ordered set that references its elements weakly, so that
+it does not keep them alive: an element is dropped from the set when it
+is garbage-collected.
+
+Bound methods are created anew each time they are looked up, so they
+are referenced through `weakref.WeakMethod`, keyed by their object and
+function: a bound method stays in the set as long as its object does,
+and looking it up again finds the same element. Elements that cannot be
+weakly referenced, and builtin functions and methods, which are also
+created anew for each lookup, are referenced strongly, and so are the
+elements for which `keep`, if given, returns true when they are added.
+
+Adding an element that is already in the set only costs a dictionary
+lookup of its `id`.
+"""
+class WeakOrderedSet:
+    def __init__(self, items=(), keep=None):
+        self._refs = {}
+        self._keep = keep
+        for item in items:
+            self.add(item)
+
+    def _remove(self, ref):
+        if self._refs.get(ref.key) is ref:
+            del self._refs[ref.key]
+
+    def __len__(self):
+        return len(self._refs)
+
+    def __iter__(self):
+        for ref in list(self._refs.values()):
+            item = ref() if type(ref) in _weak_refs else ref
+            if item is not None:
+                yield item
+
+    def __contains__(self, item):
+        key = (id(item.__self__), id(item.__func__)) if type(item) is MethodType else id(item)
+        ref = self._refs.get(key)
+        return ref is not None and (type(ref) not in _weak_refs or ref() is not None)
+
+    def __repr__(self):
+        return "{0}({1!r})".format(type(self).__name__, list(self))
+
+    def add(self, item):
+        if type(item) is MethodType:
+            key = (id(item.__self__), id(item.__func__))
+            if key not in self._refs:
+                if self._keep is not None and self._keep(item):
+                    self._refs[key] = item
+                    return
+                try:
+                    self._refs[key] = _KeyedMethodRef(item, self._remove, key)
+                except TypeError:
+                    self._refs[key] = item
+            return
+
+        key = id(item)
+        if key not in self._refs:
+            if type(item) is BuiltinMethodType or self._keep is not None and self._keep(item):
+                self._refs[key] = item
+                return
+            try:
+                self._refs[key] = KeyedRef(item, self._remove, key)
+            except TypeError:
+                self._refs[key] = item
+
+    def discard(self, item):
+        if item in self:
+            key = (id(item.__self__), id(item.__func__)) if type(item) is MethodType else id(item)
+            del self._refs[key]
+
+    def clear(self):
+        self._refs.clear()
@@ -0,0 +1,34 @@
+"""
+Networks shared by several test modules.
+"""
+
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+
+import examples.dependencies as dependencies
+
+"""
+Builds the barometer network of `examples/dependencies.py` in `network`,
+and returns its cells: the barometer shadow and height, the building
+shadow and height, and the fall time.
+"""
+def build_dependencies(network):
+    with network:
+        cells = [Cell(name) for name in ['s_ba', 'h_ba', 's', 'h', 't']]
+        s_ba, h_ba, s, h, t = cells
+        dependencies.similar_triangles(s_ba, h_ba, s, h)
+        dependencies.fall_duration(t, h)
+
+    return cells
+
+"""
+Adds the supported measurements of `examples/dependencies.py` to
+`cells`, as returned by `build_dependencies`.
+"""
+def feed_dependencies(cells):
+    s_ba, h_ba, s, h, t = cells
+    s.add_content(Supported(Interval(54.9, 55.1), {'shadows'}))
+    h_ba.add_content(Supported(Interval(0.3, 0.32), {'shadows'}))
+    s_ba.add_content(Supported(Interval(0.36, 0.37), {'shadows'}))
+    t.add_content(Supported(Interval(2.9, 3.1), {'fall time'}))
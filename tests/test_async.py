@@ -0,0 +1,114 @@
+import asyncio
+import time
+import unittest
+
+from propagator import Cell, Network, Propagator, ABORTED
+from propagator.primitives import adder
+from propagator.profiling import Profiler
+
+
+class RunAsyncTestCase(unittest.TestCase):
+    def fetcher(self, output, value, delay):
+        async def fetch():
+            await asyncio.sleep(delay)
+            output.add_content(value)
+
+        return Propagator([], fetch, [output])
+
+    def test_async_and_plain_propagators(self):
+        network = Network()
+        with network:
+            a, b, c = Cell('a'), Cell('b'), Cell('c')
+            self.fetcher(a, 2, 0.01)
+            self.fetcher(b, 3, 0.02)
+            adder(a, b, c)
+
+        asyncio.run(network.run_async())
+
+        self.assertEqual(c.content, 5)
+        self.assertEqual(len(network.scheduler.alerted_propagators), 0)
+
+    def test_async_propagators_wait_concurrently(self):
+        network = Network()
+        with network:
+            cells = [Cell() for _ in range(20)]
+            for n, cell in enumerate(cells):
+                self.fetcher(cell, n, 0.05)
+
+        start = time.perf_counter()
+        asyncio.run(network.run_async())
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([cell.content for cell in cells], list(range(20)))
+        self.assertLess(elapsed, 0.5)
+
+    def test_async_compound_builds_inside_its_network(self):
+        network = Network()
+        with network:
+            a, b = Cell('a'), Cell('b')
+            self.fetcher(a, 4, 0.01)
+            Propagator.compound([a], lambda: adder(a, a, b))
+
+        asyncio.run(network.run_async())
+
+        self.assertEqual(b.content, 8)
+
+    def test_async_propagators_are_current_after_awaiting(self):
+        network = Network()
+        profiler = Profiler()
+        network.scheduler.profiler = profiler
+        seen = []
+
+        with network:
+            a, b = Cell('a'), Cell('b')
+            fetchers = [self.fetcher(a, 2, 0.02), self.fetcher(b, 3, 0.01)]
+
+            async def watch():
+                await asyncio.sleep(0.015)
+                seen.append(network.scheduler.current_propagator)
+
+            watcher = Propagator([], watch)
+
+        asyncio.run(network.run_async())
+
+        self.assertEqual(seen, [watcher])
+        self.assertIsNone(network.scheduler.current_propagator)
+        self.assertEqual([profiler.stats[f].additions for f in fetchers], [1, 1])
+
+    def test_failing_propagator_raises(self):
+        async def fail():
+            raise ValueError("unreachable service")
+
+        network = Network()
+        with network:
+            Propagator([], fail)
+            self.fetcher(Cell(), 1, 10)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(network.run_async())
+
+    def test_abort_process_from_async_propagator(self):
+        network = Network()
+
+        async def abort():
+            await asyncio.sleep(0)
+            network.scheduler.abort_process('stop')
+
+        with network:
+            Propagator([], abort)
+            self.fetcher(Cell(), 1, 10)
+
+        self.assertEqual(asyncio.run(network.run_async()), ABORTED)
+        self.assertEqual(network.scheduler.last_value_of_run, 'stop')
+
+    def test_run_rejects_async_propagators(self):
+        network = Network()
+        with network:
+            self.fetcher(Cell(), 1, 0)
+
+        with self.assertRaises(TypeError):
+            network.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,16 @@
+import gc
+import sys
+import threading
+import time
+import tracemalloc
 import unittest
 
 from propagator import scheduler
-from propagator import Cell, Propagator
+from propagator import Cell, Propagator, Network, QUIESCENT, EXHAUSTED, ABORTED
 from propagator.merging import is_contradictory
+from propagator.primitives import adder, constant
+
+import examples.sqrt as sqrt
 
 
 class TestCaseWithScheduler(unittest.TestCase):
@@ -14,6 +22,103 @@ class SchedulerTestCase(TestCaseWithScheduler):
         self.assertEqual(len(scheduler.alerted_propagators), 0)
         self.assertEqual(len(scheduler.propagators_ever_alerted), 0)
 
+    def test_run_chain_longer_than_recursion_limit(self):
+        def copier(source, target):
+            return Propagator([source], lambda: target.add_content(source.content))
+
+        length = sys.getrecursionlimit() + 100
+        cells = [Cell() for _ in range(length)]
+        for source, target in zip(cells, cells[1:]):
+            copier(source, target)
+        scheduler.run()
+
+        cells[0].add_content(42)
+        scheduler.run()
+
+        self.assertEqual(cells[-1].content, 42)
+        self.assertEqual(scheduler.waves, length - 1)
+        self.assertEqual(scheduler.firings, length - 1)
+
+    def test_abort_process_stops_run_and_returns_value(self):
+        fired = []
+        Propagator([], lambda: fired.append('first'))
+        Propagator([], lambda: scheduler.abort_process('stop'))
+        Propagator([], lambda: fired.append('never'))
+
+        self.assertEqual(scheduler.run(), ABORTED)
+        self.assertEqual(scheduler.last_value_of_run, 'stop')
+        self.assertEqual(fired, ['first'])
+        self.assertEqual(len(scheduler.alerted_propagators), 0)
+
+    def test_abort_process_survives_broad_except(self):
+        def swallowing():
+            try:
+                scheduler.abort_process('stop')
+            except Exception:
+                pass
+
+        Propagator([], swallowing)
+
+        self.assertEqual(scheduler.run(), ABORTED)
+        self.assertEqual(scheduler.last_value_of_run, 'stop')
+
+    def test_abort_process_outside_run(self):
+        scheduler.abort_process('stop')
+        self.assertEqual(scheduler.last_value_of_run, 'stop')
+
+    def test_run_after_abort_is_quiescent(self):
+        Propagator([], lambda: scheduler.abort_process('stop'))
+        scheduler.run()
+        Propagator([], lambda: None)
+
+        self.assertEqual(scheduler.run(), QUIESCENT)
+        self.assertIsNone(scheduler.last_value_of_run)
+
+    def build_chain(self, length):
+        self.log = []
+
+        def copier(n, source, target):
+            def to_do():
+                self.log.append(n)
+                target.add_content(source.content)
+            return Propagator([source], to_do)
+
+        cells = [Cell() for _ in range(length)]
+        for n, (source, target) in enumerate(zip(cells, cells[1:])):
+            copier(n, source, target)
+        return cells
+
+    def test_run_with_max_firings_resumes(self):
+        cells = self.build_chain(10)
+        scheduler.run()
+        self.log = []
+        cells[0].add_content(1)
+
+        statuses = []
+        while not statuses or statuses[-1] == EXHAUSTED:
+            statuses.append(scheduler.run(max_firings=4))
+
+        self.assertEqual(statuses, [EXHAUSTED, EXHAUSTED, QUIESCENT])
+        self.assertEqual(cells[-1].content, 1)
+        self.assertEqual(self.log, list(range(9)))
+
+    def test_run_with_max_firings_keeps_wave_order(self):
+        cells = self.build_chain(10)
+        scheduler.run(max_firings=3)
+
+        self.assertEqual(self.log, [0, 1, 2])
+        self.assertEqual(list(scheduler.alerted_propagators)[:2], [cells[3].neighbors[0], cells[4].neighbors[0]])
+        self.assertEqual(len(scheduler.alerted_propagators), 6)
+
+    def test_run_with_past_deadline_fires_nothing(self):
+        self.build_chain(3)
+
+        self.assertEqual(scheduler.run(deadline=time.monotonic() - 1), EXHAUSTED)
+        self.assertEqual(scheduler.firings, 0)
+        self.assertEqual(len(scheduler.alerted_propagators), 2)
+        self.assertEqual(scheduler.run(deadline=time.monotonic() + 60), QUIESCENT)
+        self.assertEqual(scheduler.firings, 2)
+
 class CellTestCase(TestCaseWithScheduler):
     def test_new_cell_has_no_content(self):
         a = Cell()
@@ -48,14 +153,14 @@ class CellTestCase(TestCaseWithScheduler):
 
     def test_new_cell_has_no_neighbors(self):
         a = Cell(content='hello')
-        self.assertEqual(a.neighbors, [])
+        self.assertEqual(a.neighbors, ())
 
     def test_new_cell_with_neighbors(self):
         f = lambda x: x
 
         a = Cell(content='hello')
         a.new_neighbor(f)
-        self.assertEqual(a.neighbors, [f])
+        self.assertEqual(a.neighbors, (f,))
 
     def test_add_existing_neighbor(self):
         f = lambda x: x
@@ -65,19 +170,292 @@ class CellTestCase(TestCaseWithScheduler):
         a.new_neighbor(f)
         self.assertEqual(len(a.neighbors), 1)
 
+    def test_many_neighbors_keep_their_order(self):
+        functions = [lambda: None for _ in range(3 * Cell.MAX_TUPLE_NEIGHBORS)]
+
+        a = Cell()
+        for f in functions + functions:
+            a.new_neighbor(f)
+        self.assertEqual(list(a.neighbors), functions)
+
+        scheduler.alerted_propagators.clear()
+        a.add_content(1)
+        self.assertEqual(list(scheduler.alerted_propagators), functions)
 
 
 class PropagatorTestCase(TestCaseWithScheduler):
-    def new_propagator_appends_function_to_neighbors(self):
+    def test_new_propagator_adds_itself_to_neighbors(self):
         a = Cell()
         b = Cell()
         c = Cell()
         f = lambda x: x
 
-        Propagator([a, b, c], f)
+        propagator = Propagator([a, b, c], f)
 
         for cell in [a, b, c]:
-            self.assertEqual(cell.neighbors, [f])
+            self.assertEqual(cell.neighbors, (propagator,))
+
+
+class BatchTestCase(TestCaseWithScheduler):
+    def build_summer(self, inputs, total):
+        fired = []
+
+        def to_do():
+            fired.append(True)
+            if all(cell.content is not None for cell in inputs):
+                total.add_content(sum(cell.content for cell in inputs))
+
+        Propagator(inputs, to_do)
+        scheduler.run()
+        fired.clear()
+        return fired
+
+    def test_batch_alerts_shared_neighbor_once(self):
+        inputs = [Cell() for _ in range(10)]
+        total = Cell()
+        fired = self.build_summer(inputs, total)
+
+        with scheduler.batch():
+            for n, cell in enumerate(inputs):
+                cell.add_content(n)
+            self.assertEqual(len(scheduler.alerted_propagators), 0)
+
+        self.assertEqual(len(scheduler.alerted_propagators), 1)
+        scheduler.run()
+
+        self.assertEqual(fired, [True])
+        self.assertEqual(total.content, 45)
+
+    def test_atomic_batch_rolls_back_on_contradiction(self):
+        a = Cell(content=1)
+        b = Cell()
+        total = Cell()
+        self.build_summer([a, b], total)
+
+        with scheduler.batch(atomic=True) as batch:
+            b.add_content(2)
+            a.add_content(3)
+
+        self.assertTrue(batch.rolled_back)
+        self.assertEqual(batch.contradictions, [a])
+        self.assertEqual(a.content, 1)
+        self.assertEqual(b.content, None)
+        self.assertEqual(len(scheduler.alerted_propagators), 0)
+
+    def test_atomic_batch_commits_consistent_updates(self):
+        a = Cell(content=1)
+        b = Cell()
+        total = Cell()
+        self.build_summer([a, b], total)
+
+        with scheduler.batch(atomic=True) as batch:
+            a.add_content(1)
+            b.add_content(2)
+
+        scheduler.run()
+
+        self.assertFalse(batch.rolled_back)
+        self.assertEqual(total.content, 3)
+
+    def test_atomic_batch_rolls_back_on_exception(self):
+        a = Cell()
+
+        with self.assertRaises(KeyError):
+            with scheduler.batch(atomic=True):
+                a.add_content(1)
+                raise KeyError()
+
+        self.assertEqual(a.content, None)
+
+    def test_rollback_keeps_first_alerts_of_new_propagators(self):
+        a = Cell(content=1)
+        b = Cell()
+        total = Cell()
+        self.build_summer([a], Cell())
+
+        with scheduler.batch(atomic=True) as batch:
+            adder(a, b, total)
+            a.add_content(3)
+
+        self.assertTrue(batch.rolled_back)
+        self.assertEqual(len(scheduler.alerted_propagators), 1)
+
+        b.add_content(2)
+        scheduler.run()
+
+        self.assertEqual(total.content, 3)
+
+    def test_batch_drops_alerts_on_exception(self):
+        a = Cell()
+        total = Cell()
+        fired = self.build_summer([a], total)
+
+        with self.assertRaises(KeyError):
+            with scheduler.batch():
+                a.add_content(1)
+                raise KeyError()
+
+        self.assertEqual(a.content, 1)
+        self.assertEqual(len(scheduler.alerted_propagators), 0)
+        self.assertEqual(fired, [])
+
+    def test_network_batch(self):
+        network = Network()
+        with network:
+            a = Cell()
+            b = Cell()
+            adder(a, a, b)
+        network.run()
+
+        with network.batch():
+            a.add_content(5)
+            self.assertEqual(len(network.scheduler.alerted_propagators), 0)
+
+        network.run()
+
+        self.assertEqual(b.content, 10)
+
+
+class NetworkTestCase(TestCaseWithScheduler):
+    def test_network_cells_use_network_scheduler(self):
+        network = Network()
+        with network:
+            a = Cell()
+            b = Cell()
+            adder(a, a, b)
+
+        a.add_content(2)
+
+        self.assertEqual(len(scheduler.alerted_propagators), 0)
+        self.assertEqual(len(network.scheduler.alerted_propagators), 1)
+
+        network.run()
+
+        self.assertEqual(b.content, 4)
+
+    def test_compound_builds_inside_its_network(self):
+        built = []
+        network = Network()
+
+        with network:
+            a = Cell()
+            b = Cell()
+
+            def to_build():
+                built.append(Cell())
+                adder(a, a, b)
+
+            Propagator.compound([a], to_build)
+
+        a.add_content(3)
+        network.run()
+
+        self.assertEqual(b.content, 6)
+        self.assertIs(built[0].scheduler, network.scheduler)
+        self.assertEqual(len(scheduler.alerted_propagators), 0)
+
+    def test_networks_run_on_separate_threads(self):
+        def build_and_run(n, results):
+            network = Network()
+            with network:
+                cells = [Cell() for _ in range(200)]
+                for source, target in zip(cells, cells[1:]):
+                    adder(source, source, target)
+            cells[0].add_content(n)
+            network.run()
+            results[n] = cells[-1].content
+
+        results = {}
+        threads = [threading.Thread(target=build_and_run, args=(n, results)) for n in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {n: n * 2 ** 199 for n in range(1, 5)})
+        self.assertEqual(len(scheduler.alerted_propagators), 0)
+
+
+class WeakReferencesTestCase(TestCaseWithScheduler):
+    def test_bound_methods_live_as_long_as_their_object(self):
+        class Counter:
+            def __init__(self):
+                self.count = 0
+
+            def fire(self):
+                self.count += 1
+
+        counter, log = Counter(), []
+        scheduler.alert_propagators([counter.fire, log.clear])
+        scheduler.alert_propagators([counter.fire])
+        gc.collect()
+
+        self.assertIn(counter.fire, scheduler.propagators_ever_alerted)
+        self.assertEqual(len(scheduler.propagators_ever_alerted), 2)
+
+        scheduler.run()
+        scheduler.alert_all_propagators()
+        scheduler.run()
+        self.assertEqual(counter.count, 2)
+
+        del counter
+        gc.collect()
+        self.assertEqual(len(scheduler.propagators_ever_alerted), 1)
+
+    def test_propagators_without_inputs_are_kept(self):
+        a, fired = Cell('a'), []
+        constant(5)(a)
+        Propagator([], lambda: fired.append(True))
+        scheduler.run()
+        gc.collect()
+
+        self.assertEqual(len(scheduler.propagators_ever_alerted), 2)
+        scheduler.alert_all_propagators()
+        scheduler.run()
+        self.assertEqual(scheduler.firings, 2)
+        self.assertEqual(fired, [True, True])
+
+        del a
+        gc.collect()
+        self.assertEqual(len(scheduler.propagators_ever_alerted), 1)
+
+
+"""
+Computes square roots with `examples/sqrt.py`, whose network grows
+through compound propagators, many times in the same network, dropping
+each network once it is computed.
+"""
+class SoakTestCase(unittest.TestCase):
+    ROUNDS = 120
+    WARMUP = 20
+
+    def compute_sqrt(self, network, number):
+        with network:
+            x, answer = Cell('x'), Cell('answer')
+            sqrt.sqrt_network(x, answer)
+        x.add_content(number)
+        network.run()
+        return answer.content
+
+    def test_memory_stays_flat(self):
+        network = Network()
+
+        tracemalloc.start()
+        try:
+            for n in range(self.ROUNDS):
+                self.assertAlmostEqual(self.compute_sqrt(network, 2), 2 ** 0.5)
+                if n == self.WARMUP:
+                    gc.collect()
+                    baseline = tracemalloc.get_traced_memory()[0]
+
+            gc.collect()
+            growth = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(len(network.scheduler.propagators_ever_alerted), 0)
+        self.assertLess(growth, 64 * 1024)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from operator import add, sub
 
 from propagator import make_generic_operator, assign_operation
+from propagator.generic_operator import value_predicate, type_predicate
 
 class GenericOperatorTestCase(unittest.TestCase):
     def test_default_operation(self):
@@ -16,5 +17,105 @@ class GenericOperatorTestCase(unittest.TestCase):
         assign_operation("add", add, (is_number, is_number))
         self.assertEqual(add_op(3, 2), 5)
 
+    def test_assign_operation_invalidates_dispatch_cache(self):
+        describe = make_generic_operator(1, "describe", lambda x: "thing")
+        self.assertEqual(describe(1), "thing")
+
+        assign_operation("describe", lambda x: "int", [lambda x: isinstance(x, int)])
+        self.assertEqual(describe(1), "int")
+        self.assertEqual(describe(1.0), "thing")
+
+    def test_value_predicates_run_on_each_call(self):
+        is_positive = value_predicate(lambda x: x > 0)
+        sign = make_generic_operator(1, "sign", lambda x: "negative")
+        assign_operation("sign", lambda x: "positive", [is_positive])
+
+        self.assertEqual([sign(1), sign(-1), sign(2)], ["positive", "negative", "positive"])
+
+    def test_generic_operators_as_predicates_run_on_each_call(self):
+        is_empty = make_generic_operator(1, "is_empty", lambda x: len(x) == 0)
+        size = make_generic_operator(1, "size", len)
+        assign_operation("size", lambda x: "empty", [is_empty])
+
+        self.assertEqual([size([]), size([1, 2]), size([])], ["empty", 2, "empty"])
+
+    def test_plain_predicates_run_on_each_call(self):
+        is_empty = make_generic_operator(1, "is_empty", lambda x: len(x) == 0)
+        size = make_generic_operator(1, "size", len)
+        assign_operation("size", lambda x: "empty", [lambda x: is_empty(x)])
+
+        self.assertEqual([size([]), size([1, 2]), size([])], ["empty", 2, "empty"])
+
+    def test_type_predicates_are_cached(self):
+        calls = []
+
+        @type_predicate
+        def is_int(x):
+            calls.append(x)
+            return isinstance(x, int)
+
+        describe = make_generic_operator(1, "describe", lambda x: "thing")
+        assign_operation("describe", lambda x: "int", [is_int])
+
+        self.assertEqual([describe(1), describe(2), describe("a")], ["int", "int", "thing"])
+        self.assertEqual(calls, [1, "a"])
+
+    def test_class_operations_prefer_most_specific_classes(self):
+        kind = make_generic_operator(2, "kind", lambda x, y: "other")
+        assign_operation("kind", lambda x, y: "objects", [object, object])
+        assign_operation("kind", lambda x, y: "numbers", [(int, float), (int, float)])
+        assign_operation("kind", lambda x, y: "bool first", [bool, object])
+
+        self.assertEqual(kind("a", "b"), "objects")
+        self.assertEqual(kind(1, 2.0), "numbers")
+        self.assertEqual(kind(True, 2), "bool first")
+        self.assertEqual(kind(2, True), "numbers")
+
+    def test_class_operations_take_precedence_over_tests(self):
+        kind = make_generic_operator(1, "kind", lambda x: "other")
+        assign_operation("kind", lambda x: "test", [lambda x: isinstance(x, int)])
+        assign_operation("kind", lambda x: "class", [bool])
+
+        self.assertEqual([kind(True), kind(1), kind("a")], ["class", "test", "other"])
+
+    def test_classes_mixed_with_tests(self):
+        is_positive = value_predicate(lambda x: x > 0)
+        sign = make_generic_operator(2, "sign", lambda x, y: "other")
+        assign_operation("sign", lambda x, y: "positive", ([str, is_positive], [is_positive, str]))
+
+        self.assertEqual([sign("a", 1), sign(1, "a"), sign("a", -1)], ["positive", "positive", "other"])
+
+    def test_apply_many_keeps_order(self):
+        describe = make_generic_operator(2, "describe", lambda x, y: "other")
+        assign_operation("describe", lambda x, y: x + y, [int, int])
+        is_positive = value_predicate(lambda x: isinstance(x, int) and x > 0)
+        assign_operation("describe", lambda x, y: "positive", [is_positive, str])
+
+        self.assertEqual(
+            describe.map([(1, 2), ("a", "b"), (3, 4), (1, "a"), (-1, "a")]),
+            [3, "other", 7, "positive", "other"])
+        self.assertEqual(describe.apply_many(iter([])), [])
+
+    def test_apply_many_checks_arity_of_every_tuple(self):
+        describe = make_generic_operator(2, "describe", lambda x, y: "other")
+
+        for args_list in [[(1, 2), (3,)], [(1, 2), (3, 4, 5)], [(1,)]]:
+            with self.assertRaises(TypeError):
+                describe.apply_many(args_list)
+
+    def test_apply_many_uses_vectorized_operations(self):
+        calls = []
+
+        def vectorized(xs, ys):
+            calls.append((xs, ys))
+            return [x * y for x, y in zip(xs, ys)]
+
+        times = make_generic_operator(2, "times", lambda x, y: "other")
+        assign_operation("times", lambda x, y: x * y, [int, int], vectorized)
+
+        self.assertEqual(times.apply_many([(1, 2), ("a", "b"), (3, 4)]), [2, "other", 12])
+        self.assertEqual(calls, [([1, 3], [2, 4])])
+        self.assertEqual(times(5, 6), 30)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+import pickle
+import unittest
+
+from propagator.content.interval import Interval
+from propagator.merging import merge, is_contradictory
+from propagator.operator import add, sub, mul, truediv, square, abs, sqrt, lt, gt, le, ge
+
+class IntervalTestCase(unittest.TestCase):
+    def test_interval_is_immutable(self):
+        i = Interval(1, 2)
+
+        with self.assertRaises(AttributeError):
+            i.low = 0
+        with self.assertRaises(AttributeError):
+            i.middle = 1.5
+
+        self.assertEqual(Interval(0), Interval(0, 0))
+
+    def test_hash_and_pickle(self):
+        i = Interval(1.5, 2)
+
+        self.assertEqual(hash(i), hash(Interval(1.5, 2)))
+        self.assertEqual(len({i, Interval(1.5, 2), Interval(1, 2)}), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(i)), i)
+
+    def test_arithmetic_is_sign_correct(self):
+        i = Interval(-1, 3)
+        j = Interval(-2, 1)
+
+        self.assertEqual(add(i, j), Interval(-3, 4))
+        self.assertEqual(sub(i, j), Interval(-2, 5))
+        self.assertEqual(mul(i, j), Interval(-6, 3))
+        self.assertEqual(mul(i, -2), Interval(-6, 2))
+        self.assertEqual(truediv(Interval(1, 2), Interval(-4, -2)), Interval(-1, -0.25))
+        self.assertIsNone(truediv(Interval(1, 2), j))
+        self.assertEqual(square(i), Interval(0, 9))
+        self.assertEqual(abs(Interval(-3, -1)), Interval(1, 3))
+        self.assertEqual(abs(i), Interval(0, 3))
+
+    def test_sqrt_of_negative_numbers(self):
+        self.assertEqual(sqrt(Interval(4, 9)), Interval(2, 3))
+        self.assertEqual(sqrt(Interval(-1, 9)), Interval(0, 3))
+        self.assertTrue(is_contradictory(sqrt(Interval(-4, -1))))
+
+    def test_comparisons(self):
+        i = Interval(1, 2)
+
+        self.assertEqual([lt(i, 3), lt(i, 1), lt(i, 1.5)], [True, False, None])
+        self.assertEqual([le(i, 2), gt(3, i), ge(Interval(2, 4), i)], [True, True, True])
+
+    def test_merge(self):
+        i = Interval(1, 3)
+
+        self.assertIs(merge(i, Interval(0, 4)), i)
+        self.assertEqual(merge(i, Interval(2, 4)), Interval(2, 3))
+        self.assertEqual(merge(i, 2), 2)
+        self.assertTrue(is_contradictory(merge(i, Interval(4, 5))))
+
+
+if __name__ == '__main__':
+    unittest.main()
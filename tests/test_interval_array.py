@@ -0,0 +1,75 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from propagator import scheduler
+from propagator import Cell
+from propagator.content.interval import Interval
+from propagator.merging import merge, is_contradictory
+from propagator.operator import sqrt
+
+if numpy is not None:
+    from propagator.content.interval_array import IntervalArray
+    import examples.multidirectional_computation as barometer
+
+
+@unittest.skipIf(numpy is None, "needs NumPy")
+class IntervalArrayTestCase(unittest.TestCase):
+    def setUp(self):
+        scheduler.initialize()
+
+    def test_merge_marks_contradictory_scenarios(self):
+        content = IntervalArray([1, 2, 3], [2, 3, 4])
+        merged = merge(content, IntervalArray([1.5, 3.5, 0], [5, 5, 5]))
+
+        self.assertEqual([merged[0], merged[2]], [Interval(1.5, 2), Interval(3, 4)])
+        self.assertEqual(list(merged.contradictory), [False, True, False])
+        self.assertFalse(is_contradictory(merged))
+        self.assertTrue(is_contradictory(merge(content, 10)))
+
+    def test_merge_without_new_information_returns_content(self):
+        content = IntervalArray([1, 2], [2, 3])
+        self.assertIs(merge(content, Interval(0, 10)), content)
+        self.assertIs(merge(content, IntervalArray([1, 2], [2, 3])), content)
+
+    def test_arrays_are_copied_and_checked(self):
+        low = numpy.array([1.0, 2.0])
+        points = IntervalArray(low)
+        low[0] = 5
+
+        self.assertEqual(points[0], Interval(1, 1))
+        self.assertIsNot(points.low, points.high)
+        with self.assertRaises(ValueError):
+            IntervalArray([1, 2], [3, 4, 5])
+
+    def test_sqrt_of_negative_scenarios_is_contradictory(self):
+        roots = sqrt(IntervalArray([-4, -1, 4], [-1, 9, 9]))
+
+        self.assertEqual(list(roots.contradictory), [True, False, False])
+        self.assertEqual([roots[1], roots[2]], [Interval(0, 3), Interval(2, 3)])
+        self.assertFalse(numpy.isnan(roots.low).any())
+
+    def test_network_evaluates_every_scenario(self):
+        fall_times = [Interval(2.9, 3.1), Interval(2.9, 3.3), Interval(3.0, 3.05)]
+
+        def building_height(fall_time):
+            scheduler.initialize()
+            t, h = Cell('fall time'), Cell('building height')
+            barometer.fall_duration(t, h)
+            t.add_content(fall_time)
+            scheduler.run()
+            return h.content
+
+        expected = [building_height(fall_time) for fall_time in fall_times]
+        heights = building_height(IntervalArray([i.low for i in fall_times], [i.high for i in fall_times]))
+
+        for index, interval in enumerate(expected):
+            self.assertAlmostEqual(heights[index].low, interval.low)
+            self.assertAlmostEqual(heights[index].high, interval.high)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from propagator.merging import merge, Contradiction, is_contradictory
+from propagator.merging import merge, merge_changed, Contradiction, is_contradictory
 from propagator.content.interval import Interval
 from propagator.content.supported import Supported
 
@@ -32,3 +32,27 @@ class ContradictionTestCase(unittest.TestCase):
         m2 = merge(n, c)
         self.assertTrue(is_contradictory(m1))
         self.assertTrue(is_contradictory(m2))
+
+class MergeChangedTestCase(unittest.TestCase):
+    def test_merges_without_new_information_return_content_itself(self):
+        cases = [
+            (10, 10),
+            (Interval(5, 10), Interval(5, 10)),
+            (Interval(5, 10), Interval(3, 12)),
+            (7, Interval(5, 10)),
+            (Supported(Interval(5, 10), {'a'}), Supported(Interval(5, 10), {'a'})),
+            (Supported(Interval(5, 10), {'a'}), Supported(Interval(3, 12), {'b'})),
+        ]
+
+        for content, increment in cases:
+            self.assertIs(merge(content, increment), content)
+            self.assertEqual(merge_changed(content, increment), (content, False))
+
+    def test_merges_with_new_information_are_changes(self):
+        content = Supported(Interval(5, 10), {'a'})
+        increment = Supported(Interval(6, 12), {'b'})
+
+        self.assertEqual(merge_changed(content, increment),
+                         (Supported(Interval(6, 10), {'a', 'b'}), True))
+        self.assertEqual(merge_changed(None, 10), (10, True))
+        self.assertEqual(merge_changed(10, None), (10, False))
@@ -0,0 +1,130 @@
+import unittest
+
+from propagator import Cell, Network, Propagator, ABORTED
+from propagator.content.interval import Interval
+from propagator.parallel import ParallelScheduler, independent_batches
+from propagator.profiling import Profiler
+from propagator.primitives import adder, multiplier
+
+import examples.multidirectional_computation as barometer
+
+
+class ParallelSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = ParallelScheduler(max_workers=4)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def build_barometer(self, network):
+        with network:
+            cells = [Cell(name) for name in ['s_ba', 'h_ba', 's', 'h', 't']]
+            s_ba, h_ba, s, h, t = cells
+            barometer.similar_triangles(s_ba, h_ba, s, h)
+            barometer.fall_duration(t, h)
+
+        s.add_content(Interval(54.9, 55.1))
+        h_ba.add_content(Interval(0.3, 0.32))
+        s_ba.add_content(Interval(0.36, 0.37))
+        t.add_content(Interval(2.9, 3.1))
+        network.run()
+        h.add_content(Interval(45, 45))
+        network.run()
+
+        return [cell.content for cell in cells]
+
+    def test_same_fixpoint_as_serial_scheduler(self):
+        serial = self.build_barometer(Network())
+        parallel = self.build_barometer(Network(scheduler=self.scheduler))
+
+        self.assertEqual(parallel, serial)
+
+    def test_disjoint_propagators_share_a_batch(self):
+        network = Network(scheduler=self.scheduler)
+        with network:
+            inputs = [Cell(content=n) for n in range(100)]
+            outputs = [Cell() for _ in range(100)]
+            for i, o in zip(inputs, outputs):
+                adder(i, i, o)
+
+        network.run()
+
+        self.assertEqual([o.content for o in outputs], [2 * n for n in range(100)])
+        self.assertEqual(self.scheduler.waves, 1)
+        self.assertEqual(self.scheduler.firings, 100)
+
+    def test_merges_into_one_cell_are_serialized(self):
+        network = Network(scheduler=self.scheduler)
+        with network:
+            total = Cell()
+            for n in range(200):
+                Propagator([], lambda n=n: total.add_content(Interval(n, 400 - n)))
+
+        network.run()
+
+        self.assertEqual(total.content, Interval(199, 201))
+
+    def test_compound_builds_inside_its_network(self):
+        network = Network(scheduler=self.scheduler)
+        with network:
+            xs = [Cell() for _ in range(10)]
+            ys = [Cell() for _ in range(10)]
+            for x, y in zip(xs, ys):
+                Propagator.compound([x], lambda x=x, y=y: multiplier(x, x, y))
+
+        for n, x in enumerate(xs):
+            x.add_content(n)
+        network.run()
+
+        self.assertEqual([y.content for y in ys], [n * n for n in range(10)])
+
+    def test_abort_process_from_worker_thread(self):
+        network = Network(scheduler=self.scheduler)
+        with network:
+            for _ in range(10):
+                Propagator([], lambda: None)
+            Propagator([], lambda: self.scheduler.abort_process('stop'))
+
+        self.assertEqual(network.run(), ABORTED)
+        self.assertEqual(self.scheduler.last_value_of_run, 'stop')
+        self.assertEqual(len(self.scheduler.alerted_propagators), 0)
+
+    def test_profiler_counts_every_firing(self):
+        profiler = Profiler()
+        self.scheduler.profiler = profiler
+        network = Network(scheduler=self.scheduler)
+        with network:
+            total = Cell()
+            propagators = [Propagator([], lambda n=n: total.add_content(Interval(n, 2000 - n)))
+                    for n in range(1000)]
+
+        network.run()
+
+        self.assertEqual(sum(stats.firings for stats in profiler.stats.values()), 1000)
+        self.assertEqual(sum(stats.additions for stats in profiler.stats.values()), 1000)
+        self.assertEqual(len(profiler.stats), len(propagators))
+
+    def test_async_propagators_are_refused_in_batches(self):
+        async def body():
+            pass
+
+        network = Network(scheduler=self.scheduler)
+        with network:
+            Propagator([], lambda: None)
+            Propagator([], body)
+
+        with self.assertRaises(TypeError):
+            network.run()
+
+    def test_conflicting_outputs_go_to_later_batches(self):
+        a, b, c = Cell(), Cell(), Cell()
+        p1 = Propagator([], lambda: None, [a])
+        p2 = Propagator([], lambda: None, [a, b])
+        p3 = Propagator([], lambda: None, [c])
+        p4 = Propagator([], lambda: None, [b])
+
+        self.assertEqual(list(independent_batches([p1, p2, p3, p4])), [[p1, p3, p4], [p2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import io
+import json
+import unittest
+
+from propagator import Cell, Network, Propagator
+from propagator.primitives import adder, multiplier, constant
+from propagator.profiling import Profiler
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.network = Network()
+        self.profiler = Profiler()
+        self.network.scheduler.profiler = self.profiler
+
+    def test_counts_firings_and_changes(self):
+        with self.network:
+            a, b, c = Cell('a'), Cell('b'), Cell('c')
+            add = adder(a, b, c)
+            constant(2)(a)
+
+        self.network.run()
+        b.add_content(3)
+        self.network.run()
+
+        stats = self.profiler.stats[add]
+        self.assertEqual(stats.label, "add(a, b -> c)")
+        self.assertEqual(stats.firings, 3)
+        self.assertEqual(stats.additions, 3)
+        self.assertEqual(stats.changes, 1)
+        self.assertGreaterEqual(stats.total_time, stats.max_time)
+
+    def test_compound_propagators_are_named(self):
+        with self.network:
+            a, b = Cell('a', 2), Cell('b')
+
+            def square_of_a():
+                multiplier(a, a, b)
+
+            Propagator.compound([a], square_of_a)
+
+        self.network.run()
+
+        labels = sorted(stats.label for stats in self.profiler.stats.values())
+        self.assertEqual(labels, ["compound(square_of_a)(a)", "mul(a, a -> b)"])
+
+    def test_dump_is_sorted_json(self):
+        with self.network:
+            a, b = Cell('a', 1), Cell('b')
+            adder(a, a, b)
+            Propagator([a], lambda: sum(range(100000)), name="slow")
+
+        self.network.run()
+        output = io.StringIO()
+        self.profiler.dump(output)
+        rows = json.loads(output.getvalue())
+
+        self.assertEqual(rows[0]["label"], "slow(a)")
+        self.assertEqual(set(rows[0]), {"label", "firings", "total_time", "max_time", "additions", "changes"})
+
+    def test_report_lists_propagators(self):
+        with self.network:
+            a, b = Cell('a', 1), Cell('b')
+            adder(a, a, b)
+
+        self.network.run()
+        output = io.StringIO()
+        self.profiler.report(file=output)
+
+        self.assertIn("add(a, a -> b)", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import io
+import os
+import tempfile
+import unittest
+
+from propagator import Cell, Network
+from propagator.content.interval import Interval
+from propagator.merging import is_contradictory
+from propagator.primitives import adder
+from propagator.recording import Recorder, read_records, replay, ROLLED_BACK
+
+from tests.networks import build_dependencies, feed_dependencies
+
+
+class RecorderTestCase(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".plog")
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_replay_rebuilds_contents(self):
+        network = Network()
+        cells = build_dependencies(network)
+
+        with Recorder(self.path) as recorder:
+            network.scheduler.recorder = recorder
+            feed_dependencies(cells)
+            network.run()
+
+        contents = replay(self.path)
+
+        for cell in cells:
+            self.assertEqual(contents[cell.id], cell.content)
+
+        rebuilt = Network()
+        rebuilt_cells = build_dependencies(rebuilt)
+        replay(self.path, rebuilt_cells)
+
+        self.assertEqual([cell.content for cell in rebuilt_cells], [cell.content for cell in cells])
+
+    def test_records_name_the_triggering_propagator(self):
+        network = Network()
+        with network:
+            a, b, c = Cell('a'), Cell('b'), Cell('c')
+            add = adder(a, b, c)
+
+        buffer = io.BytesIO()
+        recorder = Recorder(buffer)
+        network.scheduler.recorder = recorder
+        a.add_content(1)
+        b.add_content(2)
+        network.run()
+        recorder.flush()
+        buffer.seek(0)
+
+        records = list(read_records(buffer))
+
+        self.assertEqual(records[0], (a.id, -1, 1, 1))
+        self.assertEqual(records[1], (b.id, -1, 2, 2))
+        self.assertEqual(records[-1], (c.id, add.id, 3, 3))
+
+    def test_replay_up_to_contradiction(self):
+        network = Network()
+        with network:
+            a = Cell('a')
+
+        with Recorder(self.path) as recorder:
+            network.scheduler.recorder = recorder
+            a.add_content(Interval(1, 5))
+            a.add_content(Interval(2, 4))
+            a.add_content(Interval(6, 7))
+
+        records = list(read_records(self.path))
+        first = next(n for n, record in enumerate(records) if is_contradictory(record.content))
+
+        self.assertEqual(first, 2)
+        self.assertEqual(replay(self.path, stop=first), {a.id: Interval(2, 4)})
+
+    def test_rolled_back_batches_are_recorded(self):
+        network = Network()
+        with network:
+            a = Cell('a', 1)
+
+        with Recorder(self.path) as recorder:
+            network.scheduler.recorder = recorder
+            with network.batch(atomic=True) as batch:
+                a.add_content(2)
+
+        self.assertTrue(batch.rolled_back)
+        self.assertEqual(replay(self.path), {a.id: 1})
+        self.assertEqual(list(read_records(self.path))[-1], (a.id, ROLLED_BACK, 1, 1))
+
+    def test_recorder_starts_a_new_log(self):
+        for content in [1, 2]:
+            network = Network()
+            with network:
+                a = Cell('a')
+
+            with Recorder(self.path) as recorder:
+                network.scheduler.recorder = recorder
+                a.add_content(content)
+
+        self.assertEqual(list(read_records(self.path)), [(a.id, -1, 2, 2)])
+
+    def test_buffer_is_flushed_when_full(self):
+        buffer = io.BytesIO()
+        recorder = Recorder(buffer, buffer_size=8)
+        network = Network()
+        network.scheduler.recorder = recorder
+
+        with network:
+            cells = [Cell(content=n) for n in range(20)]
+
+        self.assertEqual(len(list(read_records(io.BytesIO(buffer.getvalue())))), 16)
+        recorder.flush()
+        buffer.seek(0)
+        self.assertEqual(len(list(read_records(buffer))), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
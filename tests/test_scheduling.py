@@ -0,0 +1,141 @@
+import unittest
+
+from propagator import scheduler
+from propagator import Cell, Propagator
+from propagator.scheduling import FIFOPolicy, PriorityPolicy, CostPolicy, RankPolicy
+
+
+class TestCaseWithScheduler(unittest.TestCase):
+    def tearDown(self):
+        scheduler.initialize(FIFOPolicy())
+
+    def logging_copier(self, name, inputs, output):
+        def to_do():
+            self.log.append(name)
+            output.add_content(inputs[-1].content)
+
+        return Propagator(inputs, to_do, [output])
+
+    """
+    Builds a diamond in which `d` is computed from `a` and from the end
+    of the chain `a -> b -> c`.
+    """
+    def build_diamond(self):
+        self.log = []
+        a, b, c, d = Cell('a'), Cell('b'), Cell('c'), Cell('d')
+        self.logging_copier('ab', [a], b)
+        self.logging_copier('bc', [b], c)
+        self.logging_copier('d', [a, c], d)
+        scheduler.run()
+        self.log = []
+        return a, b, c, d
+
+
+class PolicyTestCase(TestCaseWithScheduler):
+    def test_default_policy_is_fifo(self):
+        scheduler.initialize()
+        self.assertIsInstance(scheduler.alerted_propagators, FIFOPolicy)
+
+    def test_fifo_refires_diamond_sink(self):
+        scheduler.initialize(FIFOPolicy())
+        a, b, c, d = self.build_diamond()
+
+        a.add_content(1)
+        scheduler.run()
+
+        self.assertEqual(d.content, 1)
+        self.assertEqual(self.log, ['ab', 'd', 'bc', 'd'])
+
+    def test_fifo_queues_each_propagator_once_per_wave(self):
+        scheduler.initialize(FIFOPolicy())
+        policy = scheduler.alerted_propagators
+        a = Cell('a')
+        p, q = Propagator([a], lambda: None), Propagator([a], lambda: None)
+        f, g = (lambda: None), [].clear
+        policy.clear()
+
+        for item in [p, f, g, q, p, f, g]:
+            policy.add(item)
+
+        self.assertEqual(list(policy), [p, f, g, q])
+        self.assertIn(g, policy)
+        self.assertEqual(policy.next_wave(), [p, f, g, q])
+        self.assertNotIn(p, policy)
+
+        policy.add(q)
+        policy.requeue([p, q, f])
+        self.assertEqual(policy.next_wave(), [p, f, q])
+
+    def test_fifo_queues_do_not_change_or_share_items(self):
+        class Unhashable:
+            __hash__ = None
+
+            def __call__(self):
+                pass
+
+        f, h = (lambda: None), Unhashable()
+        first, second = FIFOPolicy(), FIFOPolicy()
+
+        for item in [f, h, f, h]:
+            first.add(item)
+        second.add(f)
+
+        self.assertEqual(vars(f), {})
+        self.assertEqual(first.next_wave(), [f, h])
+        self.assertIn(f, second)
+        self.assertNotIn(h, first)
+        self.assertEqual(second.next_wave(), [f])
+
+    def test_rank_fires_diamond_sink_once(self):
+        scheduler.initialize(RankPolicy())
+        a, b, c, d = self.build_diamond()
+
+        a.add_content(1)
+        scheduler.run()
+
+        self.assertEqual(d.content, 1)
+        self.assertEqual(self.log, ['ab', 'bc', 'd'])
+
+    def test_rank_of_cycle_terminates(self):
+        policy = RankPolicy()
+        scheduler.initialize(policy)
+        self.log = []
+        a, b = Cell('a'), Cell('b')
+        ab = self.logging_copier('ab', [a], b)
+        ba = self.logging_copier('ba', [b], a)
+
+        a.add_content(1)
+        scheduler.run()
+
+        self.assertEqual(b.content, 1)
+        self.assertEqual(sorted([policy.rank(ab), policy.rank(ba)]), [0, 1])
+
+    def test_cost_fires_cheapest_first(self):
+        order = []
+        costs = {}
+        scheduler.initialize(CostPolicy(lambda p: costs[p]))
+
+        for name, cost in [('expensive', 3), ('cheap', 1), ('medium', 2)]:
+            to_do = lambda name=name: order.append(name)
+            costs[to_do] = cost
+            scheduler.alert_propagators(to_do)
+
+        scheduler.run()
+
+        self.assertEqual(order, ['cheap', 'medium', 'expensive'])
+        self.assertEqual(scheduler.waves, 3)
+
+    def test_priority_wave_holds_ties(self):
+        policy = PriorityPolicy(lambda p: p[0])
+        for item in ['b1', 'a1', 'b2', 'a2']:
+            policy.add(item)
+        policy.add('a1')
+
+        self.assertEqual(len(policy), 4)
+        self.assertEqual(policy.next_wave(), ['a1', 'a2'])
+        self.assertEqual(policy.next_wave(), ['b1', 'b2'])
+        self.assertEqual(policy.next_wave(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import io
+import unittest
+
+from propagator import Cell, Network, Propagator
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.merging import Contradiction
+from propagator.primitives import adder
+from propagator import snapshot
+
+from tests.networks import build_dependencies, feed_dependencies
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def test_restore_quiescent_network_runs_nothing(self):
+        network = Network()
+        cells = build_dependencies(network)
+        feed_dependencies(cells)
+        network.run()
+
+        buffer = io.BytesIO()
+        snapshot.save(buffer, network.scheduler)
+        buffer.seek(0)
+
+        restored = Network()
+        restored_cells = build_dependencies(restored)
+        snapshot.restore(buffer, restored.scheduler)
+
+        self.assertEqual([c.content for c in restored_cells], [c.content for c in cells])
+        self.assertFalse(restored.scheduler.alerted_propagators)
+        restored.run()
+        self.assertEqual(restored.scheduler.firings, 0)
+
+    def test_restore_resumes_pending_propagators(self):
+        expected = Network()
+        expected_cells = build_dependencies(expected)
+        feed_dependencies(expected_cells)
+        expected.run()
+
+        network = Network()
+        cells = build_dependencies(network)
+        feed_dependencies(cells)
+        network.run(max_firings=10)
+        self.assertTrue(network.scheduler.alerted_propagators)
+
+        buffer = io.BytesIO()
+        snapshot.save(buffer, network.scheduler)
+        buffer.seek(0)
+
+        restored = Network()
+        restored_cells = build_dependencies(restored)
+        snapshot.restore(buffer, restored.scheduler)
+        restored.run()
+
+        self.assertEqual([c.content for c in restored_cells], [c.content for c in expected_cells])
+
+    def test_changed_inputs_alert_their_neighbors(self):
+        network = Network()
+        with network:
+            a, b, c = Cell('a'), Cell('b'), Cell('c')
+            adder(a, b, c)
+        a.add_content(1)
+        network.run()
+
+        buffer = io.BytesIO()
+        snapshot.save(buffer, network.scheduler)
+
+        restored = Network()
+        with restored:
+            a, b, c = Cell('a'), Cell('b', 2), Cell('c')
+            add = adder(a, b, c)
+        buffer.seek(0)
+        snapshot.restore(buffer, restored.scheduler)
+
+        self.assertEqual(list(restored.scheduler.alerted_propagators), [add])
+        restored.run()
+        self.assertEqual(restored.scheduler.firings, 1)
+        self.assertEqual(c.content, 3)
+
+    def test_cells_written_by_undeclared_outputs(self):
+        def build(network):
+            with network:
+                a, b, c = Cell('a'), Cell('b'), Cell('c')
+                Propagator([], lambda: a.add_content(2))
+                adder(b, b, c)
+            return a, b, c
+
+        network = Network()
+        a, b, c = build(network)
+        b.add_content(1)
+        network.run()
+
+        buffer = io.BytesIO()
+        snapshot.save(buffer, network.scheduler, [a])
+
+        restored = Network()
+        cells = build(restored)
+        buffer.seek(0)
+        with self.assertWarns(RuntimeWarning):
+            snapshot.restore(buffer, restored.scheduler)
+        self.assertEqual([cell.content for cell in cells], [None, 1, 2])
+
+        restored = Network()
+        cells = build(restored)
+        buffer.seek(0)
+        snapshot.restore(buffer, restored.scheduler, [cells[0]])
+        self.assertEqual([cell.content for cell in cells], [2, 1, 2])
+
+    def test_contents_round_trip(self):
+        network = Network()
+        with network:
+            cells = [Cell('a', Interval(1, 2)),
+                     Cell('b', Supported(Interval(3, 4), {'x', 'y'})),
+                     Cell('c', Contradiction('no')),
+                     Cell('d')]
+
+        buffer = io.BytesIO()
+        snapshot.save(buffer, network.scheduler, cells)
+        buffer.seek(0)
+        saved = snapshot.load(buffer)
+
+        self.assertEqual(saved.contents[cells[0].id], Interval(1, 2))
+        self.assertEqual(saved.contents[cells[1].id], Supported(Interval(3, 4), {'x', 'y'}))
+        self.assertEqual(repr(saved.contents[cells[2].id]), "Contradiction('no')")
+        self.assertNotIn(cells[3].id, saved.contents)
+
+
+if __name__ == '__main__':
+    unittest.main()
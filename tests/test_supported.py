@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from propagator import scheduler
@@ -17,6 +18,45 @@ class SupportTestCase(unittest.TestCase):
         s1 = Support(["source1", "source2", "source3"])
         s2 = Support(["source1", "source2"])
         self.assertTrue(s2.more_informative_than(s1))
+        self.assertFalse(s1.more_informative_than(s2))
+        self.assertFalse(s1.more_informative_than(Support(s1)))
+
+    def test_support_behaves_as_a_set_of_premises(self):
+        s1 = Support(["source2", "source1"])
+        s2 = Support(["source3"])
+
+        self.assertEqual(s1 | s2, Support(["source1", "source2", "source3"]))
+        self.assertEqual(s1, {"source1", "source2"})
+        self.assertEqual(hash(s1), hash(Support(["source1", "source2"])))
+        self.assertTrue(s1.issubset(s1 | s2))
+        self.assertIn("source1", s1)
+        self.assertNotIn("source3", s1)
+        self.assertEqual(len(s1 | s2), 3)
+        self.assertEqual(str(s1), "{'source1', 'source2'}")
+
+        with self.assertRaises(AttributeError):
+            s1.bits = 0
+
+    def test_support_interoperates_with_sets(self):
+        s1 = Support(["source1", "source2"])
+
+        self.assertTrue(s1.issubset({"source1", "source2", "source3"}))
+        self.assertTrue(s1.issubset(["source1", "source2"]))
+        self.assertEqual(s1 | {"source3"}, {"source1", "source2", "source3"})
+        self.assertEqual({"source3"} | s1, Support(["source1", "source2", "source3"]))
+        self.assertEqual(s1 & frozenset(["source2"]), {"source2"})
+        self.assertTrue(s1 <= frozenset(["source1", "source2"]))
+        self.assertTrue(frozenset(["source1"]) < s1)
+        self.assertFalse(s1 < {"source1"})
+        self.assertEqual(hash(s1), hash(frozenset(["source1", "source2"])))
+        self.assertEqual(len({s1, frozenset(["source1", "source2"])}), 1)
+
+    def test_support_pickles_as_premises(self):
+        support = Support(["source1", "source4"])
+        payload = pickle.dumps(support)
+
+        self.assertIn(b"source4", payload)
+        self.assertEqual(pickle.loads(payload), support)
 
 class SupportedTestCase(TestCaseWithScheduler):
     def test_adder_exact(self):
@@ -73,6 +113,18 @@ class SupportedTestCase(TestCaseWithScheduler):
         sup2 = Supported(Interval(6, 9), {'this'})
         self.assertFalse(sup1.subsumes(sup2))
 
+    def test_supported_is_immutable_and_hashable(self):
+        sup1 = Supported(Interval(5, 10), {'this', 'that'})
+        sup2 = Supported(Interval(5, 10), {'that', 'this'})
+
+        with self.assertRaises(AttributeError):
+            sup1.value = Interval(6, 9)
+
+        self.assertEqual(hash(sup1), hash(sup2))
+        self.assertEqual(len({sup1, sup2, Supported(Interval(5, 10), {'this'})}), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(sup1)), sup1)
+        self.assertEqual(hash(Supported([1, 2])), hash(Supported([1, 2])))
+
 class SupportedMergeTestCase(TestCaseWithScheduler):
     def test_merge_none_and_supported_interval(self):
         nil = None
@@ -0,0 +1,157 @@
+import pickle
+import unittest
+
+from propagator import scheduler
+from propagator import Cell, Network
+from propagator.content.interval import Interval
+from propagator.content.supported import Supported
+from propagator.content.tms import TMS, worldview_of, kick_out, bring_in
+from propagator.merging import merge
+from propagator.primitives import adder, multiplier, conditional
+
+import examples.dependencies as dependencies
+
+
+class TMSTestCase(unittest.TestCase):
+    def setUp(self):
+        scheduler.initialize()
+        worldview_of(scheduler).reset()
+
+    def tearDown(self):
+        worldview_of(scheduler).reset()
+
+    def test_merge_keeps_alternatives(self):
+        rough = Supported(Interval(1, 3), {'rough'})
+        fine = Supported(Interval(2, 3), {'fine'})
+        tms = merge(TMS([rough]), TMS([fine]))
+
+        self.assertEqual(set(tms.values), {rough, fine})
+        self.assertEqual(tms.consequence(), fine)
+        self.assertIs(merge(tms, TMS([Supported(Interval(0, 4), {'fine'})])), tms)
+
+        kick_out('fine')
+        self.assertEqual(tms.consequence(), rough)
+        kick_out('rough')
+        self.assertIsNone(tms.consequence())
+        bring_in('fine')
+        self.assertEqual(tms.consequence(), fine)
+
+    def test_worldviews_of_the_barometer_network(self):
+        barometer_height = Cell('barometer height')
+        barometer_shadow = Cell('barometer shadow')
+        building_height = Cell('building height')
+        building_shadow = Cell('building shadow')
+        fall_time = Cell('fall time')
+
+        dependencies.similar_triangles(barometer_shadow, barometer_height, building_shadow, building_height)
+        dependencies.fall_duration(fall_time, building_height)
+
+        building_shadow.add_content(TMS([Supported(Interval(54.9, 55.1), {'shadows'})]))
+        barometer_height.add_content(TMS([Supported(Interval(0.3, 0.32), {'shadows'})]))
+        barometer_shadow.add_content(TMS([Supported(Interval(0.36, 0.37), {'shadows'})]))
+        fall_time.add_content(TMS([Supported(Interval(2.9, 3.1), {'fall time'})]))
+        scheduler.run()
+
+        both = building_height.content.consequence()
+        self.assertEqual(both.support, {'shadows', 'fall time'})
+
+        kick_out('fall time')
+        scheduler.run()
+        self.assertEqual(building_height.content.consequence(),
+                         Supported(Interval(44.51351351351351, 48.977777777777774), {'shadows'}))
+
+        kick_out('shadows')
+        scheduler.run()
+        self.assertIsNone(building_height.content.consequence())
+
+        bring_in('fall time')
+        bring_in('shadows')
+        scheduler.run()
+        self.assertEqual(building_height.content.consequence(), both)
+
+    def test_flipping_a_premise_alerts_only_its_readers(self):
+        totals = []
+        for n in range(10):
+            a, b, total = Cell(), Cell(), Cell()
+            adder(a, b, total)
+            a.add_content(TMS([Supported(n, {'a{n}'.format(n=n)})]))
+            b.add_content(TMS([Supported(1, {'b{n}'.format(n=n)})]))
+            totals.append(total)
+        scheduler.run()
+
+        kick_out('a3')
+        scheduler.run()
+
+        self.assertEqual(scheduler.firings, 1)
+        self.assertIsNone(totals[3].content.consequence())
+        self.assertEqual(totals[4].content.consequence(), Supported(5, {'a4', 'b4'}))
+
+        bring_in('a3')
+        scheduler.run()
+        self.assertEqual(totals[3].content.consequence(), Supported(4, {'a3', 'b3'}))
+
+    def test_each_network_has_its_own_worldview(self):
+        networks = [Network(), Network()]
+        totals = []
+        for network in networks:
+            with network:
+                a, b, total = Cell(), Cell(), Cell()
+                adder(a, b, total)
+            a.add_content(TMS([Supported(1, {'a'})]))
+            b.add_content(TMS([Supported(2, {'b'})]))
+            network.run()
+            totals.append(total)
+
+        kick_out('a', networks[0])
+        for network in networks:
+            network.run()
+
+        self.assertFalse(worldview_of(networks[0]).is_believed('a'))
+        self.assertTrue(worldview_of(networks[1]).is_believed('a'))
+        self.assertTrue(worldview_of(scheduler).is_believed('a'))
+        self.assertEqual(networks[1].scheduler.firings, 0)
+        self.assertIsNone(totals[0].content.consequence(worldview_of(networks[0])))
+        self.assertEqual(totals[1].content.consequence(worldview_of(networks[1])),
+                         Supported(3, {'a', 'b'}))
+
+    def test_cells_merge_in_the_worldview_of_their_network(self):
+        network = Network()
+        cell = network.cell('c', TMS([Supported(1, {'bad'})]))
+        kick_out('bad', network)
+
+        with network.batch(atomic=True) as batch:
+            cell.add_content(TMS([Supported(2, {'good'})]))
+
+        self.assertFalse(batch.rolled_back)
+        self.assertTrue(worldview_of(scheduler).is_believed('bad'))
+        self.assertEqual(cell.content.consequence(worldview_of(network)), Supported(2, {'good'}))
+
+    def test_flipping_a_premise_alerts_conditionals(self):
+        predicate, if_true, if_false, output = Cell(), Cell(), Cell(), Cell()
+        conditional(predicate, if_true, if_false, output)
+        kick_out('no')
+        predicate.add_content(TMS([Supported(True, {'yes'}), Supported(False, {'no'})]))
+        if_true.add_content('big')
+        if_false.add_content(TMS([Supported('small', {'measured'})]))
+        scheduler.run()
+
+        self.assertEqual(output.content.consequence(), Supported('big', {'yes'}))
+
+        kick_out('yes')
+        bring_in('no')
+        scheduler.run()
+        self.assertEqual(output.content.consequence(), Supported('small', {'no', 'measured'}))
+
+    def test_tms_mixes_with_flat_and_supported_values(self):
+        x, y, product = Cell(), Cell(), Cell()
+        multiplier(x, y, product)
+        x.add_content(TMS([Supported(Interval(2, 3), {'x'})]))
+        y.add_content(2)
+        scheduler.run()
+
+        self.assertEqual(product.content.consequence(), Supported(Interval(4, 6), {'x'}))
+        self.assertEqual(pickle.loads(pickle.dumps(product.content)), product.content)
+
+
+if __name__ == '__main__':
+    unittest.main()
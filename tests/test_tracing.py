@@ -0,0 +1,112 @@
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from propagator import Cell, Network, QUIESCENT
+from propagator.primitives import adder
+from propagator.tracing import Tracer, LoggingTracer
+
+
+class EventTracer(Tracer):
+    def __init__(self):
+        self.events = []
+
+    def run_started(self, scheduler):
+        self.events.append(('run_started',))
+
+    def run_finished(self, scheduler, status):
+        self.events.append(('run_finished', status))
+
+    def fired(self, propagator):
+        self.events.append(('fired', propagator.name))
+
+    def new_cell(self, cell):
+        self.events.append(('new_cell', cell.name))
+
+    def content_added(self, cell, increment, content, changed):
+        self.events.append(('content_added', cell.name, increment, content, changed))
+
+
+"""
+A content that counts how many times it is turned into a string.
+"""
+class Loud:
+    formatted = 0
+
+    def __repr__(self):
+        Loud.formatted += 1
+        return "Loud()"
+
+    def __str__(self):
+        return repr(self)
+
+
+class TracerTestCase(unittest.TestCase):
+    def test_events(self):
+        network = Network()
+        tracer = EventTracer()
+        network.scheduler.tracer = tracer
+
+        with network:
+            a, b, c = Cell('a'), Cell('b'), Cell('c')
+            adder(a, b, c)
+        a.add_content(1)
+        b.add_content(2)
+        b.add_content(2)
+        network.run()
+
+        self.assertEqual(tracer.events, [
+            ('content_added', 'a', None, None, False),
+            ('new_cell', 'a'),
+            ('content_added', 'b', None, None, False),
+            ('new_cell', 'b'),
+            ('content_added', 'c', None, None, False),
+            ('new_cell', 'c'),
+            ('content_added', 'a', 1, 1, True),
+            ('content_added', 'b', 2, 2, True),
+            ('content_added', 'b', 2, 2, False),
+            ('run_started',),
+            ('fired', 'add'),
+            ('content_added', 'c', 3, 3, True),
+            ('run_finished', QUIESCENT),
+        ])
+
+    def test_logging_tracer_formats_nothing_when_disabled(self):
+        logger = logging.getLogger("propagator.test_tracing")
+        logger.setLevel(logging.INFO)
+        network = Network()
+        network.scheduler.tracer = LoggingTracer(logger)
+
+        Loud.formatted = 0
+        with network:
+            a = Cell('a', Loud())
+        network.run()
+
+        self.assertEqual(Loud.formatted, 0)
+
+        logger.setLevel(logging.DEBUG)
+        with self.assertLogs(logger, logging.DEBUG) as logs:
+            with network:
+                Cell('b', Loud())
+
+        self.assertEqual(logs.output, [
+            "DEBUG:propagator.test_tracing:Adding content Loud() to Cell('b', Loud())",
+            "DEBUG:propagator.test_tracing:New cell: Cell('b', Loud())",
+        ])
+        self.assertGreater(Loud.formatted, 0)
+
+    def test_import_writes_no_files(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            subprocess.check_call(
+                [sys.executable, "-c", "import propagator, propagator.logging, propagator.primitives"],
+                cwd=directory, env=dict(os.environ, PYTHONPATH=root))
+            self.assertEqual(os.listdir(directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()